@@ -0,0 +1,91 @@
+# ailod.py
+# Nível de detalhe da IA dos zumbis: quem está perto do player roda o
+# steering completo todo tick; quem está longe roda a cada k ticks
+# (escalonado pelo uid do zumbi, que não muda quando a lista é compactada,
+# para não cair todo mundo no mesmo tick) e, entre uma atualização e outra,
+# só repete o último deslocamento.
+import math
+import time
+
+# (distância máxima ao player em px, atualiza a cada k ticks); a última faixa
+# vale para qualquer distância maior
+LOD_BANDS = ((400, 1), (800, 2), (1400, 4), (math.inf, 8))
+
+# modo adaptativo: se a IA passar do orçamento, sobe um nível (faixas mais
+# curtas e períodos maiores); se ficar bem abaixo, desce
+LOD_BUDGET_MS = 2.0
+LOD_MAX_LEVEL = 4
+LOD_RADIUS_SHRINK = 0.7
+
+
+class AIScheduler:
+    """
+    update() substitui o laço de steering do Game. adaptive=True usa o tempo
+    real medido, então não é determinístico (replays divergem).
+    """
+
+    def __init__(self, bands=LOD_BANDS, adaptive=False, budget_ms=LOD_BUDGET_MS):
+        self.bands = tuple(sorted(bands))
+        self.adaptive = adaptive
+        self.budget_ms = budget_ms
+        self.level = 0
+        self.tick = 0
+        self.full_updates = 0
+        self.coasted = 0
+        self._levels = [self._scaled(level) for level in range(LOD_MAX_LEVEL + 1)]
+
+    def _scaled(self, level):
+        # faixas em distância ao quadrado; nível n encolhe os raios e alonga os períodos
+        shrink = LOD_RADIUS_SHRINK ** level
+        return tuple(((radius * shrink) ** 2, period if period == 1 else period * (1 + level))
+                     for radius, period in self.bands)
+
+    def update(self, enemies, player, steer, obstacles, others=()):
+        """steer(enemy) roda o steering completo de um inimigo. others: outros
+        players (co-op); vale a distância ao mais perto."""
+        self.tick += 1
+        tick = self.tick
+        bands = self._levels[self.level]
+        px = player.centerx
+        py = player.centery
+        full = 0
+        start = time.perf_counter() if self.adaptive else 0.0
+
+        for enemy in enemies:
+            dx = enemy.centerx - px
+            dy = enemy.centery - py
+            d2 = dx * dx + dy * dy
+            for other in others:
+                ox = enemy.centerx - other.centerx
+                oy = enemy.centery - other.centery
+                if ox * ox + oy * oy < d2:
+                    d2 = ox * ox + oy * oy
+            period = 1
+            for r2, k in bands:
+                period = k
+                if d2 <= r2:
+                    break
+            if period == 1 or (tick + enemy.uid) % period == 0:
+                pos = enemy.pos
+                x0 = pos.x
+                y0 = pos.y
+                steer(enemy)
+                enemy.vel_x = pos.x - x0
+                enemy.vel_y = pos.y - y0
+                enemy.coast_clear = 0
+                if period > 1:
+                    enemy.plan_coast(period, obstacles)
+                full += 1
+            else:
+                enemy.coast(obstacles)
+
+        self.full_updates = full
+        self.coasted = len(enemies) - full
+        if self.adaptive:
+            self._adapt((time.perf_counter() - start) * 1000.0)
+
+    def _adapt(self, elapsed_ms):
+        if elapsed_ms > self.budget_ms and self.level < LOD_MAX_LEVEL:
+            self.level += 1
+        elif elapsed_ms < self.budget_ms * 0.5 and self.level > 0:
+            self.level -= 1
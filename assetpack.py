@@ -0,0 +1,134 @@
+# assetpack.py
+# Pacote de assets pré-processados: as imagens já escaladas para uma
+# resolução e já no formato de pixel da tela (BGRA de 32 bits), num único
+# arquivo. O loader mapeia o arquivo na memória (mmap) e cria as surfaces
+# com pygame.image.frombuffer, sem decodificar PNG nem copiar pixels.
+#
+# Layout do arquivo:
+#   MAGIC (4 bytes) | versão (u16) | tamanho do cabeçalho (u32) | cabeçalho JSON
+#   | blocos de pixels, cada um alinhado em ALIGN bytes
+import json
+import mmap
+import os
+import struct
+
+import pygame
+
+MAGIC = b"BZPK"
+VERSION = 1
+PIXEL_FORMAT = "BGRA"
+ALIGN = 64
+_PREFIX = struct.Struct("<4sHI")
+
+
+def pack_name(width, height):
+    return os.path.join("assets", f"pack-{width}x{height}.bzpk")
+
+
+def _spec_key(spec):
+    path, size, alpha = spec
+    return [path, list(size), bool(alpha)]
+
+
+def build(out_path, specs, load):
+    """
+    Gera o pacote. specs: nome -> (arquivo, (w, h), alpha);
+    load(arquivo) -> Surface decodificada (ex.: pygame.image.load).
+    """
+    entries = {}
+    blobs = []
+    offset = 0
+    for name, spec in specs.items():
+        path, size, alpha = spec
+        surf = pygame.transform.scale(load(path), size)
+        data = pygame.image.tobytes(surf, PIXEL_FORMAT)
+        pad = (-offset) % ALIGN
+        offset += pad
+        blobs.append(b"\0" * pad)
+        entries[name] = {"spec": _spec_key(spec), "offset": offset, "length": len(data)}
+        blobs.append(data)
+        offset += len(data)
+
+    header = json.dumps({"format": PIXEL_FORMAT, "assets": entries}).encode("utf-8")
+    start = _PREFIX.size + len(header)
+    data_start = start + (-start) % ALIGN
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - start))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+class AssetPack:
+    def __init__(self, path):
+        self.view = None
+        self.map = None
+        self.file = open(path, "rb")
+        try:
+            # ACCESS_COPY: mapeamento privado (frombuffer pede buffer gravável);
+            # nenhuma página é copiada enquanto ninguém escreve nela
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, header_len = _PREFIX.unpack_from(self.map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"pacote inválido ou de outra versão: {path}")
+            header = json.loads(bytes(self.map[_PREFIX.size:_PREFIX.size + header_len]))
+        except Exception:
+            self.close()
+            raise
+        start = _PREFIX.size + header_len
+        self.data_start = start + (-start) % ALIGN
+        self.format = header["format"]
+        self.entries = header["assets"]
+        self.view = memoryview(self.map)
+
+    def matches(self, specs):
+        """True se o pacote tem todas as imagens com os mesmos tamanhos/arquivos."""
+        for name, spec in specs.items():
+            entry = self.entries.get(name)
+            if entry is None or entry["spec"] != _spec_key(spec):
+                return False
+        return True
+
+    def image(self, name, size, alpha=True):
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        start = self.data_start + entry["offset"]
+        buf = self.view[start:start + entry["length"]]
+        surf = pygame.image.frombuffer(buf, size, self.format)
+        if not alpha:
+            # imagem opaca: desliga o blend por pixel (blit vira cópia direta)
+            surf.set_alpha(None)
+        return surf
+
+    def close(self):
+        # surfaces ainda vivas seguram o buffer; nesse caso o mmap fica aberto
+        try:
+            if getattr(self, "view", None) is not None:
+                self.view.release()
+            if getattr(self, "map", None) is not None:
+                self.map.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+
+def open_pack(path, specs):
+    """Abre o pacote se existir e bater com os specs; senão retorna None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        pack = AssetPack(path)
+    except Exception as e:
+        print(f"[WARN] Falha ao abrir pacote de assets '{path}': {e}")
+        return None
+    if not pack.matches(specs):
+        print(f"[WARN] Pacote de assets '{path}' desatualizado; usando os PNGs")
+        pack.close()
+        return None
+    return pack
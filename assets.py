@@ -0,0 +1,130 @@
+# assets.py
+# Caminho dos assets e carregamento em segundo plano: imagens e sons são
+# decodificados num pool de threads (o pygame solta o GIL durante o decode de
+# PNG/MP3 e o scale) enquanto o jogo já mostra placeholders; poll(), chamado
+# na thread principal, converte para o formato da tela e troca pelo real.
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import audio
+
+PLACEHOLDER_COLOR = (255, 0, 255, 128)
+
+
+def asset_path(filename):
+    """
+    Retorna caminho correto para assets:
+    - quando empacotado pelo PyInstaller -> usa sys._MEIPASS
+    - quando roda em .py -> usa o diretório do projeto
+    """
+    if hasattr(sys, "_MEIPASS"):
+        base = sys._MEIPASS
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, filename)
+
+
+class Silent:
+    """Som mudo: placeholder enquanto o som real não chega ou se falhar."""
+
+    def play(self, *a, **k): pass
+    def stop(self, *a, **k): pass
+    def set_volume(self, *a, **k): pass
+
+
+def placeholder_image(size=(32, 32)):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(PLACEHOLDER_COLOR)
+    return surf
+
+
+def _decode_image(path, size):
+    # roda numa thread do pool: decode e scale, sem convert (precisa da tela)
+    return pygame.transform.scale(pygame.image.load(asset_path(path)), size)
+
+
+def _decode_sound(path):
+    return audio.load_sound(asset_path(path))
+
+
+class AssetManager:
+    """
+    Carrega imagens e sons em paralelo. image()/sound() devolvem na hora um
+    placeholder (ou a imagem do pacote pré-escalado, se houver); quando o
+    asset real fica pronto, poll() chama os callbacks de on_ready(nome, asset).
+    """
+
+    def __init__(self, pack=None, workers=4):
+        self.pack = pack
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.pending = {}
+        self.assets = {}
+        self.total = 0
+        self.listeners = []
+
+    def on_ready(self, callback):
+        self.listeners.append(callback)
+
+    def image(self, name, path, size, alpha=True):
+        self.total += 1
+        if self.pack is not None:
+            surf = self.pack.image(name, size, alpha)
+            if surf is not None:
+                self.assets[name] = surf
+                return surf
+        future = self.executor.submit(_decode_image, path, size)
+        self.pending[name] = (future, path, lambda img: img.convert_alpha() if alpha else img.convert())
+        self.assets[name] = placeholder_image(size)
+        return self.assets[name]
+
+    def sound(self, name, path, volume=None):
+        self.total += 1
+        future = self.executor.submit(_decode_sound, path)
+
+        def finish(snd):
+            if volume is not None:
+                snd.set_volume(volume)
+            return snd
+
+        self.pending[name] = (future, path, finish)
+        self.assets[name] = Silent()
+        return self.assets[name]
+
+    def __getitem__(self, name):
+        return self.assets[name]
+
+    def progress(self):
+        """(prontos, total)."""
+        return self.total - len(self.pending), self.total
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def poll(self):
+        """Finaliza os assets prontos (na thread principal). Retorna quantos chegaram."""
+        ready = [name for name, (future, _, _) in self.pending.items() if future.done()]
+        for name in ready:
+            future, path, finish = self.pending.pop(name)
+            try:
+                asset = finish(future.result())
+            except Exception as e:
+                # fica com o placeholder (magenta / mudo)
+                print(f"[WARN] Falha ao carregar '{path}': {e} (tentado: {asset_path(path)})")
+                continue
+            self.assets[name] = asset
+            for callback in self.listeners:
+                callback(name, asset)
+        return len(ready)
+
+    def wait(self):
+        """Bloqueia até todos os assets chegarem (ex.: benchmarks)."""
+        for future, _, _ in list(self.pending.values()):
+            future.exception()
+        self.poll()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,151 @@
+# audio.py
+# Subsistema de áudio:
+# - cache em disco do PCM já decodificado (o MP3 só é decodificado na
+#   primeira execução; depois o Sound sai direto dos bytes crus)
+# - canais do mixer reservados por categoria (ambiência, arma, dano,
+#   stingers), para um tiroteio nunca roubar o canal da ambiência
+# - limite de vozes simultâneas e intervalo mínimo entre disparos por som
+import hashlib
+import os
+
+import pygame
+
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 512
+
+# canais reservados por categoria; o resto fica livre para Sound.play()
+CATEGORIES = {"ambience": 1, "weapon": 4, "hurt": 2, "stingers": 1}
+FREE_CHANNELS = 4
+
+
+def init_mixer():
+    pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+
+
+def default_cache_dir():
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "battlezone", "audio")
+
+
+CACHE_DIR = os.environ.get("BATTLEZONE_AUDIO_CACHE", default_cache_dir())
+
+
+def _cache_key(path):
+    # conteúdo do arquivo + formato do mixer: PCM de outro formato não serve
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        h.update(f.read())
+    h.update(repr(pygame.mixer.get_init()).encode())
+    return h.hexdigest()
+
+
+def load_sound(path, cache_dir=CACHE_DIR):
+    """Carrega um som usando o cache de PCM decodificado (pode rodar em thread)."""
+    cached = None
+    if cache_dir:
+        cached = os.path.join(cache_dir, _cache_key(path) + ".pcm")
+        try:
+            with open(cached, "rb") as f:
+                return pygame.mixer.Sound(buffer=f.read())
+        except OSError:
+            pass
+
+    sound = pygame.mixer.Sound(path)
+    if cached:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(sound.get_raw())
+            os.replace(tmp, cached)
+        except OSError as e:
+            print(f"[WARN] Não foi possível gravar o cache de áudio '{cached}': {e}")
+    return sound
+
+
+class SoundSlot:
+    __slots__ = ("sound", "category", "max_voices", "cooldown_ms", "last_play")
+
+    def __init__(self, category, max_voices, cooldown_ms):
+        self.sound = None
+        self.category = category
+        self.max_voices = max_voices
+        self.cooldown_ms = cooldown_ms
+        self.last_play = None
+
+
+class Cue:
+    """Atalho com play() para um som do AudioManager (mesma interface do Sound)."""
+
+    def __init__(self, audio, name):
+        self.audio = audio
+        self.name = name
+
+    def play(self, loops=0):
+        return self.audio.play(self.name, loops)
+
+    def stop(self):
+        self.audio.stop(self.name)
+
+    def set_volume(self, volume):
+        slot = self.audio.slots[self.name]
+        if slot.sound is not None:
+            slot.sound.set_volume(volume)
+
+
+class AudioManager:
+    def __init__(self, categories=CATEGORIES):
+        reserved = sum(categories.values())
+        if pygame.mixer.get_num_channels() < reserved + FREE_CHANNELS:
+            pygame.mixer.set_num_channels(reserved + FREE_CHANNELS)
+        pygame.mixer.set_reserved(reserved)
+        self.channels = {}
+        first = 0
+        for category, count in categories.items():
+            self.channels[category] = [pygame.mixer.Channel(first + i) for i in range(count)]
+            first += count
+        self.started = {}
+        self.slots = {}
+
+    def register(self, name, category, max_voices=1, cooldown_ms=0):
+        self.slots[name] = SoundSlot(category, max_voices, cooldown_ms)
+        return Cue(self, name)
+
+    def set_sound(self, name, sound):
+        self.slots[name].sound = sound
+
+    def play(self, name, loops=0, now=None):
+        """Toca o som no canal da categoria dele. Retorna o Channel ou None se foi descartado."""
+        slot = self.slots.get(name)
+        if slot is None or slot.sound is None:
+            return None
+        if now is None:
+            now = pygame.time.get_ticks()
+        if slot.last_play is not None and now - slot.last_play < slot.cooldown_ms:
+            return None
+
+        channels = self.channels[slot.category]
+        started = self.started
+        voices = [ch for ch in channels if ch.get_busy() and ch.get_sound() is slot.sound]
+        if len(voices) >= slot.max_voices:
+            # no limite: a voz mais antiga do próprio som dá lugar à nova
+            channel = min(voices, key=lambda ch: started.get(ch, 0))
+        else:
+            channel = next((ch for ch in channels if not ch.get_busy()), None)
+            if channel is None:
+                channel = min(channels, key=lambda ch: started.get(ch, 0))
+        channel.play(slot.sound, loops)
+        started[channel] = now
+        slot.last_play = now
+        return channel
+
+    def stop(self, name):
+        slot = self.slots.get(name)
+        if slot is None or slot.sound is None:
+            return
+        for channel in self.channels[slot.category]:
+            if channel.get_sound() is slot.sound:
+                channel.stop()
@@ -0,0 +1,122 @@
+# batch.py
+# Roda muitas partidas sem tela, jogadas pelo Bot, num pool de processos e
+# agrega os resultados (sobrevivência, kills por wave, dano levado) para
+# ajustar os parâmetros das waves com dados em vez de playtest.
+#
+# Uso:
+#   python batch.py --games 2000
+#   python batch.py --games 500 --set spawn_init=25 --set speed_step=0.3 --out result.json
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from game import Game, TICK_RATE
+from bot import Bot
+
+# parâmetros do Game que podem ser trocados com --set nome=valor
+PARAMS = ("spawn_init", "spawn_base", "spawn_per_wave", "speed_init", "speed_step",
+          "max_waves", "obstacles_count")
+
+
+def play(job):
+    """Uma partida completa (roda dentro de um processo do pool)."""
+    seed, params, max_ticks, width, height = job
+    game = Game(width, height, seed=seed, **params)
+    bot = Bot()
+    ticks = 0
+    while ticks < max_ticks and not game.finished:
+        game.apply(bot.act(game))
+        game.events.clear()
+        ticks += 1
+    result = game.summary()
+    result["seed"] = seed
+    return result
+
+
+def distribution(values):
+    data = sorted(values)
+    n = len(data)
+
+    def pick(q):
+        return data[min(n - 1, int(q * n))]
+
+    return {"mean": sum(data) / n, "p10": pick(0.10), "p50": pick(0.50), "p90": pick(0.90)}
+
+
+def aggregate(results):
+    n = len(results)
+    waves = max(len(r["kills_per_wave"]) for r in results)
+    kills_per_wave = []
+    for i in range(waves):
+        # média só entre as partidas que chegaram nessa wave
+        reached = [r["kills_per_wave"][i] for r in results if len(r["kills_per_wave"]) > i]
+        kills_per_wave.append({"reached": len(reached) / n, "mean_kills": sum(reached) / len(reached)})
+    return {
+        "games": n,
+        "win_rate": sum(r["won"] for r in results) / n,
+        "loss_rate": sum(r["lost"] for r in results) / n,
+        "survival_s": distribution([r["survival_s"] for r in results]),
+        "kills": distribution([r["kills"] for r in results]),
+        "damage_taken": distribution([r["damage_taken"] for r in results]),
+        "kills_per_wave": kills_per_wave,
+    }
+
+
+def parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        if name not in PARAMS:
+            raise SystemExit(f"parâmetro desconhecido: {name} (válidos: {', '.join(PARAMS)})")
+        params[name] = json.loads(value)
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--minutes", type=float, default=10.0, help="limite de tempo simulado por partida")
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--set", action="append", default=[], metavar="NOME=VALOR",
+                        help=f"parâmetro do Game ({', '.join(PARAMS)}); pode repetir")
+    parser.add_argument("--out", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    params = parse_params(args.set)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    max_ticks = int(args.minutes * 60 * TICK_RATE)
+    jobs = [(args.seed + i, params, max_ticks, width, height) for i in range(args.games)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        chunk = max(1, args.games // (args.workers * 8))
+        results = list(pool.map(play, jobs, chunksize=chunk))
+    wall = time.perf_counter() - start
+
+    report = {
+        "params": params,
+        "seed": args.seed,
+        "size": [width, height],
+        "wall_s": wall,
+        "summary": aggregate(results),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    print(f"{args.games} partidas em {wall:.1f}s com {args.workers} processos", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
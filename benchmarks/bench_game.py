@@ -0,0 +1,181 @@
+# benchmarks/bench_game.py
+# Suíte de benchmark do loop do jogo (handle_events, update e draw) com o
+# driver dummy do SDL. Cada cenário é semeado, então execuções são comparáveis.
+# Saída em JSON com percentis por fase.
+#
+# Uso:
+#   python benchmarks/bench_game.py                      # todos os cenários
+#   python benchmarks/bench_game.py --scenario crowd --ticks 300 --out bench.json
+#   python benchmarks/bench_game.py --enemies 500 --bullets 50 --obstacles 40 --speed 1.6
+import argparse
+import json
+import os
+import random
+import sys
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"  # mantém o stdout só com o JSON
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import main as app
+from bullet import Bullet
+from enemy import Enemy
+from pipeline import capture
+from game import ENEMY_SIZE, BULLET_SIZE, BULLET_SPEED, PLAYER_START_LIFE, TICK_MS
+
+game = app.game
+
+SCENARIOS = {
+    "baseline": {"enemies": 20, "bullets": 5, "obstacles": 10, "speed": 1.0},
+    "late_wave": {"enemies": 33, "bullets": 10, "obstacles": 10, "speed": 1.6},
+    "crowd": {"enemies": 300, "bullets": 20, "obstacles": 10, "speed": 1.0},
+    "bullet_storm": {"enemies": 100, "bullets": 200, "obstacles": 10, "speed": 1.0},
+    "dense_obstacles": {"enemies": 100, "bullets": 20, "obstacles": 150, "speed": 1.0},
+}
+
+# seções do Game.profiler lidas a cada tick ("update" é o game.apply inteiro)
+PHASES = (
+    "handle_events",
+    "update", "update.player", "update.enemies", "update.bullets", "update.waves",
+    "snapshot", "draw.background", "draw.sprites", "draw.hud",
+)
+
+
+def percentiles(samples):
+    data = sorted(samples)
+    n = len(data)
+
+    def pick(q):
+        return data[min(n - 1, int(q * n))] * 1000.0
+
+    return {
+        "mean_ms": sum(data) / n * 1000.0,
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": data[-1] * 1000.0,
+    }
+
+
+def random_enemy(rng, speed):
+    size = ENEMY_SIZE
+    return Enemy(rng.randint(0, game.width - size), rng.randint(0, game.height - size), size, speed)
+
+
+def random_bullet(rng):
+    p = game.player
+    # alvo sorteado longe do player para a direção nunca ser nula
+    tx = rng.choice((-1, 1)) * rng.randint(100, 1000) + p.centerx
+    ty = rng.choice((-1, 1)) * rng.randint(100, 1000) + p.centery
+    return Bullet(p.centerx, p.centery, tx, ty, BULLET_SIZE, BULLET_SPEED)
+
+
+def setup(scenario, seed):
+    # mede com os assets reais, não com os placeholders
+    app.assets.wait()
+    game.reseed(seed)
+    app.restart()
+    game.spawn_obstacles(scenario["obstacles"])
+    game.enemy_speed = scenario["speed"]
+    game.enemies.clear()
+    rng = random.Random(seed)
+    for _ in range(scenario["enemies"]):
+        game.enemies.append(random_enemy(rng, scenario["speed"]))
+    if game.enemy_swarm is not None:
+        game.enemy_swarm.set_obstacles(game.obstacles)
+        game.enemy_swarm.attach(game.enemies)
+    for _ in range(scenario["bullets"]):
+        game.bullets.append(random_bullet(rng))
+    # o player não morre durante a medição (refill restaura a vida a cada tick)
+    game.player.life = PLAYER_START_LIFE
+    app.renderer.invalidate()
+    return rng
+
+
+def refill(scenario, rng):
+    # mantém N inimigos e M balas em jogo (fora da medição)
+    missing = scenario["enemies"] - len(game.enemies)
+    for _ in range(missing):
+        game.enemies.append(random_enemy(rng, scenario["speed"]))
+    if missing > 0 and game.enemy_swarm is not None:
+        game.enemy_swarm.attach(game.enemies)
+    for _ in range(scenario["bullets"] - len(game.bullets)):
+        game.bullets.append(random_bullet(rng))
+    game.player.life = PLAYER_START_LIFE
+
+
+def run_scenario(name, scenario, ticks, seed):
+    rng = setup(scenario, seed)
+    samples = {phase: [] for phase in PHASES}
+    # o tick medido é o do jogo (game.apply e main.draw); os tempos por fase
+    # saem das seções que eles já abrem no profiler
+    profiler = game.profiler
+    profiler.enabled = True
+    section = profiler.section
+
+    for tick in range(ticks):
+        refill(scenario, rng)
+        # um clique a cada 6 ticks para exercitar o handle_events
+        if tick % 6 == 0:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0)))
+        profiler.begin_frame()
+        with section("handle_events"):
+            app.handle_events()
+        with section("update"):
+            game.apply(app.keyboard.next(), TICK_MS)
+        with section("snapshot"):
+            snap = capture(game)
+        app.draw(snap, 1.0)
+        app.renderer.present()
+        app.play_events(game.events)
+        game.events.clear()
+        profiler.end_frame()
+        for phase in PHASES:
+            samples[phase].append(profiler.current.get(phase, 0.0))
+
+    return {
+        "scenario": name,
+        "params": dict(scenario, ticks=ticks, seed=seed),
+        "phases": {phase: percentiles(values) for phase, values in samples.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="cenário pré-definido (pode repetir); padrão: todos")
+    parser.add_argument("--enemies", type=int)
+    parser.add_argument("--bullets", type=int)
+    parser.add_argument("--obstacles", type=int)
+    parser.add_argument("--speed", type=float)
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--out", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    custom = {k: getattr(args, k) for k in ("enemies", "bullets", "obstacles", "speed")
+              if getattr(args, k) is not None}
+    if custom:
+        scenarios = {"custom": dict(SCENARIOS["baseline"], **custom)}
+    else:
+        names = args.scenario or list(SCENARIOS)
+        scenarios = {name: SCENARIOS[name] for name in names}
+
+    results = {
+        "resolution": [game.width, game.height],
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "results": [run_scenario(name, sc, args.ticks, args.seed) for name, sc in scenarios.items()],
+    }
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
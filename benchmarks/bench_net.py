@@ -0,0 +1,45 @@
+# benchmarks/bench_net.py
+# Servidor co-op e clientes bots em loopback UDP (net.loopback): banda por
+# cliente, custo por tick da simulação e da montagem dos snapshots, tamanho
+# máximo de datagrama e erro da previsão, sem perda e com perda simulada.
+#
+# Uso: python benchmarks/bench_net.py [--players 4] [--zombies 500] [--ticks 600] [--out arquivo.json]
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import net
+
+LOSSES = (0.0, 0.05, 0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--zombies", type=int, default=500)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="grava o JSON completo aqui")
+    args = parser.parse_args()
+
+    runs = []
+    print(f"{'perda':>6} {'down kbps':>10} {'up kbps':>8} {'sim p50':>8} {'net p50':>8} "
+          f"{'maior dgram':>11} {'visões erradas':>14} {'erro prev px':>12}")
+    for loss in LOSSES:
+        r = net.loopback(args.players, args.zombies, args.ticks, args.seed, loss)
+        runs.append(r)
+        print(f"{loss:>6.0%} {r['per_client_kbps']['down']:>10.1f} {r['per_client_kbps']['up']:>8.1f} "
+              f"{r['tick_ms']['sim']['p50']:>8.2f} {r['tick_ms']['net']['p50']:>8.2f} "
+              f"{r['max_datagram_bytes']:>11} {r['view_mismatches']:>14} "
+              f"{r['prediction_error_px']['mean']:>12.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(runs, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_scores.py
+# Placar local (scores.py): quanto o frame paga por submit() comparado com
+# gravar a partida direto no disco, e quanto custa abrir o placar com um log
+# grande usando o índice compactado comparado com reler o log inteiro.
+# Confere também que um bit trocado no meio do log só perde aquela partida.
+#
+# Uso: python benchmarks/bench_scores.py [--runs N] [--history N]
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scores
+from scores import ScoreStore, Run
+
+RECORD_SIZE = scores.RECORD.size
+
+
+def make_runs(n, seed):
+    rng = random.Random(seed)
+    return [Run(1.7e9 + i, rng.randrange(0, 20000), rng.randrange(0, 200), rng.randint(1, 4),
+                rng.random() < 0.1, rng.randint(0, 3), rng.randrange(1, 500), rng.randrange(0, 200),
+                rng.randrange(10000, 600000))
+            for i in range(n)]
+
+
+def percentile(samples, q):
+    data = sorted(samples)
+    return data[min(len(data) - 1, int(len(data) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200, help="partidas gravadas na medição do submit")
+    parser.add_argument("--history", type=int, default=200000, help="partidas no log da medição de abertura")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    root = tempfile.mkdtemp(prefix="bzscores")
+    try:
+        runs = make_runs(args.runs, args.seed)
+
+        # gravação síncrona: append + fsync na thread do frame
+        path = os.path.join(root, "sync.log")
+        sync = []
+        with open(path, "ab") as f:
+            for run in runs:
+                t = time.perf_counter()
+                f.write(run.pack())
+                f.flush()
+                os.fsync(f.fileno())
+                sync.append(time.perf_counter() - t)
+
+        store = ScoreStore(os.path.join(root, "async"))
+        store.ready.wait()
+        queued = []
+        for run in runs:
+            t = time.perf_counter()
+            store.submit(run)
+            queued.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        store.close()
+        drain = time.perf_counter() - t
+
+        print(f"{'gravação':<22} {'p50 (us)':>10} {'p99 (us)':>10}")
+        print(f"{'síncrona (fsync)':<22} {percentile(sync, 0.5) * 1e6:>10.1f} {percentile(sync, 0.99) * 1e6:>10.1f}")
+        print(f"{'submit()':<22} {percentile(queued, 0.5) * 1e6:>10.1f} {percentile(queued, 0.99) * 1e6:>10.1f}")
+        print(f"thread de gravação: {drain * 1000:.1f} ms para esvaziar a fila, {store.compactions} compactações")
+
+        # abertura com histórico grande: índice + cauda do log vs log inteiro
+        big = os.path.join(root, "big")
+        os.makedirs(big)
+        history = make_runs(args.history, args.seed + 1)
+        with open(os.path.join(big, scores.LOG_NAME), "wb") as f:
+            f.write(b"".join(run.pack() for run in history))
+        store = ScoreStore(big)
+        store.ready.wait()
+        store.compact()
+        store.close()
+
+        t = time.perf_counter()
+        ranked = sorted(scores.read_log(os.path.join(big, scores.LOG_NAME))[0], key=Run.sort_key)
+        full = time.perf_counter() - t
+        t = time.perf_counter()
+        store = ScoreStore(big)
+        store.ready.wait()
+        indexed = time.perf_counter() - t
+        store.close()
+        assert [r.score for r in store.top] == [r.score for r in ranked[:scores.TOP_N]]
+        print(f"abrir com {args.history} partidas: log inteiro {full * 1000:.1f} ms, "
+              f"índice {indexed * 1000:.2f} ms")
+
+        # log sem índice com um byte trocado no 2º registro e um registro
+        # cortado no fim: só o cortado é apagado do disco
+        damaged = os.path.join(root, "damaged")
+        os.makedirs(damaged)
+        log = bytearray(b"".join(run.pack() for run in make_runs(5, args.seed + 2)))
+        log[RECORD_SIZE + 10] ^= 0xFF
+        log_path = os.path.join(damaged, scores.LOG_NAME)
+        with open(log_path, "wb") as f:
+            f.write(log + runs[0].pack()[:RECORD_SIZE // 2])
+        store = ScoreStore(damaged)
+        store.ready.wait()
+        store.close()
+        size = os.path.getsize(log_path)
+        assert len(store.top) == 4, store.top
+        assert size == 5 * RECORD_SIZE, size
+        print(f"log com um registro corrompido: {len(store.top)} de 5 partidas mantidas, "
+              f"log com {size} bytes")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
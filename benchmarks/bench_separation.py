@@ -0,0 +1,59 @@
+# benchmarks/bench_separation.py
+# Mede o tempo de um tick de movimento dos inimigos (separação) com e sem
+# o SpatialHash, de 20 a 2000 inimigos.
+#
+# Uso: python benchmarks/bench_separation.py [--ticks N] [--seed S]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from enemy import Enemy
+from spatial import SpatialHash
+
+WIDTH, HEIGHT = 1920, 1080
+ENEMY_SIZE = 40
+SIZES = (20, 50, 100, 200, 500, 1000, 2000)
+
+
+def make_wave(n, rng):
+    return [Enemy(rng.randint(0, WIDTH - ENEMY_SIZE), rng.randint(0, HEIGHT - ENEMY_SIZE), ENEMY_SIZE, 1.0)
+            for _ in range(n)]
+
+
+def run(n, ticks, use_grid, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    enemies = make_wave(n, rng)
+    player = pygame.Rect(WIDTH // 2, HEIGHT // 2, 50, 50)
+    grid = SpatialHash(ENEMY_SIZE) if use_grid else None
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if grid is not None:
+            grid.rebuild(enemies)
+        for e in enemies:
+            e.move_towards_player(player, enemies, [], grid)
+    return (time.perf_counter() - start) / ticks * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-brute", type=int, default=1000,
+                        help="não roda o modo sem grid acima desse tamanho")
+    args = parser.parse_args()
+
+    print(f"{'inimigos':>8} {'sem grid (ms/tick)':>20} {'com grid (ms/tick)':>20}")
+    for n in SIZES:
+        brute = run(n, args.ticks, False, args.seed) if n <= args.max_brute else float("nan")
+        hashed = run(n, args.ticks, True, args.seed)
+        print(f"{n:>8} {brute:>20.3f} {hashed:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_swarm.py
+# Compara um tick de movimento da horda no caminho por objeto (Enemy +
+# SpatialHash) com o motor vetorizado de swarm.py, e diz se o tick do swarm
+# cabe no orçamento de um frame a 60 FPS.
+#
+# Uso: python benchmarks/bench_swarm.py [--ticks N] [--seed S]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import swarm
+from enemy import Enemy
+from spatial import SpatialHash
+
+WIDTH, HEIGHT = 1920, 1080
+ENEMY_SIZE = 40
+BOX_SIZE = 50
+SIZES = (100, 1000, 2000, 5000, 10000)
+# um frame a 60 FPS
+BUDGET_MS = 1000.0 / 60
+
+
+def make_scene(n, seed):
+    rng = random.Random(seed)
+    enemies = [Enemy(rng.randint(0, WIDTH - ENEMY_SIZE), rng.randint(0, HEIGHT - ENEMY_SIZE), ENEMY_SIZE, 1.0)
+               for _ in range(n)]
+    obstacles = [pygame.Rect(rng.randint(0, WIDTH - BOX_SIZE), rng.randint(0, HEIGHT - BOX_SIZE), BOX_SIZE, BOX_SIZE)
+                 for _ in range(10)]
+    player = pygame.Rect(WIDTH // 2, HEIGHT // 2, 50, 50)
+    return enemies, obstacles, player
+
+
+def run_objects(n, ticks, seed):
+    enemies, obstacles, player = make_scene(n, seed)
+    random.seed(seed)
+    grid = SpatialHash(ENEMY_SIZE)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        grid.rebuild(enemies)
+        for e in enemies:
+            e.move_towards_player(player, enemies, obstacles, grid)
+    return (time.perf_counter() - start) / ticks * 1000.0
+
+
+def run_swarm(n, ticks, seed):
+    enemies, obstacles, player = make_scene(n, seed)
+    s = swarm.Swarm(ENEMY_SIZE, seed=seed)
+    s.set_obstacles(obstacles)
+    s.attach(enemies)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        s.step(player)
+    return (time.perf_counter() - start) / ticks * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if not swarm.available():
+        print("numpy não está instalado; nada a comparar")
+        return
+
+    print(f"{'inimigos':>8} {'objetos (ms/tick)':>18} {'swarm (ms/tick)':>16} {f'<= {BUDGET_MS:.1f} ms':>11}")
+    for n in SIZES:
+        obj = run_objects(n, args.ticks, args.seed)
+        vec = run_swarm(n, args.ticks, args.seed)
+        print(f"{n:>8} {obj:>18.2f} {vec:>16.2f} {'sim' if vec <= BUDGET_MS else 'NÃO':>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_timers.py
+# Custo por tick de timers por entidade: cada entidade com o seu "desde
+# quando" conferido todo tick (o jeito antigo da recarga e da invencibilidade)
+# contra o timers.Scheduler, que só toca nos timers que vencem.
+#
+# Uso: python benchmarks/bench_timers.py [--ticks N] [--seed S]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timers import Scheduler
+
+TICK_MS = 1000.0 / 60
+SIZES = (100, 1000, 5000, 20000)
+# duração de cada timer (ms); ao vencer, a entidade arma outro
+DURATION = (1000, 10000)
+
+
+class Entity:
+    __slots__ = ("start", "duration", "flashing")
+
+    def __init__(self):
+        self.start = 0.0
+        self.duration = 0.0
+        self.flashing = False
+
+
+def run_polling(n, ticks, seed):
+    rng = random.Random(seed)
+    entities = [Entity() for _ in range(n)]
+    for e in entities:
+        e.duration = rng.uniform(*DURATION)
+    now = 0.0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        now += TICK_MS
+        for e in entities:
+            if now - e.start >= e.duration:
+                e.flashing = not e.flashing
+                e.start = now
+                e.duration = rng.uniform(*DURATION)
+    return (time.perf_counter() - start) / ticks * 1000.0
+
+
+def run_scheduler(n, ticks, seed):
+    rng = random.Random(seed)
+    timers = Scheduler()
+
+    def expire(e):
+        e.flashing = not e.flashing
+        timers.after(rng.uniform(*DURATION), expire, e)
+
+    for _ in range(n):
+        timers.after(rng.uniform(*DURATION), expire, Entity())
+    start = time.perf_counter()
+    for _ in range(ticks):
+        timers.advance(TICK_MS)
+    return (time.perf_counter() - start) / ticks * 1000.0, timers.fired / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'entidades':>9} {'polling (ms/tick)':>18} {'scheduler (ms/tick)':>20} {'vencidos/tick':>14}")
+    for n in SIZES:
+        poll = run_polling(n, args.ticks, args.seed)
+        sched, fired = run_scheduler(n, args.ticks, args.seed)
+        print(f"{n:>9} {poll:>18.3f} {sched:>20.3f} {fired:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
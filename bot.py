@@ -0,0 +1,55 @@
+# bot.py
+# Jogador automático simples para partidas sem tela (batch.py): foge dos
+# zumbis próximos, puxa de leve para o centro do mapa e atira no mais perto
+# numa cadência parecida com a de um jogador clicando.
+import math
+
+from inputs import TickInput
+
+
+class Bot:
+    def __init__(self, fire_interval=10, flee_radius=250):
+        self.fire_interval = fire_interval  # ticks entre cliques
+        self.flee_radius = flee_radius
+        self.tick = 0
+
+    def act(self, game):
+        """Input do próximo tick (inputs.TickInput), como se viesse do teclado e mouse."""
+        self.tick += 1
+        player = game.player
+        px, py = player.centerx, player.centery
+        r2 = self.flee_radius * self.flee_radius
+
+        nearest = None
+        best = math.inf
+        flee_x = flee_y = 0.0
+        for enemy in game.enemies:
+            dx = px - enemy.centerx
+            dy = py - enemy.centery
+            d2 = dx * dx + dy * dy
+            if d2 < best:
+                best = d2
+                nearest = enemy
+            if 0 < d2 < r2:
+                # mais perto pesa mais
+                w = 1.0 / d2
+                flee_x += dx * w
+                flee_y += dy * w
+
+        # puxa para o centro para não ficar preso nos cantos
+        cx = (game.width / 2 - px) / game.width
+        cy = (game.height / 2 - py) / game.height
+        move_x = flee_x * 100.0 + cx
+        move_y = flee_y * 100.0 + cy
+        # vira uma das 8 direções do WASD
+        length = math.hypot(move_x, move_y)
+        inp = TickInput()
+        if length > 0:
+            inp.dx = round(move_x / length)
+            inp.dy = round(move_y / length)
+
+        if nearest is not None and best > 0 and self.tick % self.fire_interval == 0:
+            inp.fire = True
+            inp.aim_x = nearest.centerx
+            inp.aim_y = nearest.centery
+        return inp
@@ -1,18 +1,61 @@
 import pygame
 import math
+import itertools
+
+# id único de cada bala disparada (reuso pelo pool ganha id novo); usado pela rede
+_uids = itertools.count(1)
 
 class Bullet:
+    __slots__ = ("uid", "rect", "x", "y", "vel_x", "vel_y", "alive", "prev_x", "prev_y")
+
+    # retângulo temporário para os testes de varredura (evita alocar por bala)
+    _swept = pygame.Rect(0, 0, 0, 0)
+
     def __init__(self, x, y, target_x, target_y, bullet_size, bullet_speed):
-        self.rect = pygame.Rect(x-bullet_size//2, y-bullet_size//2, bullet_size, bullet_size)
+        self.rect = pygame.Rect(0, 0, bullet_size, bullet_size)
+        self.reset(x, y, target_x, target_y, bullet_size, bullet_speed)
+
+    def reset(self, x, y, target_x, target_y, bullet_size, bullet_speed):
+        """Reinicia a bala para reuso (pool), sem alocar outro Rect."""
+        self.uid = next(_uids)
+        # posição em float; o rect é só o arredondamento (desenho e broadphase)
+        self.x = x - bullet_size / 2
+        self.y = y - bullet_size / 2
+        self.rect.size = (bullet_size, bullet_size)
+        self._sync_rect()
         dx = target_x - x
         dy = target_y - y
         dist = math.hypot(dx, dy)
         self.vel_x = bullet_speed * dx / dist
         self.vel_y = bullet_speed * dy / dist
+        self.alive = True
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def _sync_rect(self):
+        self.rect.x = round(self.x)
+        self.rect.y = round(self.y)
 
     def move(self):
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self._sync_rect()
+
+    def place(self, x, y):
+        self.x = x
+        self.y = y
+        self._sync_rect()
+
+    def swept_rect(self, from_x, from_y):
+        """Rect que cobre a bala de (from_x, from_y) até a posição atual."""
+        size = self.rect.width
+        left = math.floor(min(from_x, self.x))
+        top = math.floor(min(from_y, self.y))
+        right = math.ceil(max(from_x, self.x)) + size
+        bottom = math.ceil(max(from_y, self.y)) + size
+        swept = Bullet._swept
+        swept.update(left, top, right - left, bottom - top)
+        return swept
 
     def offscreen(self, WIDTH, HEIGHT):
         return (self.rect.x < 0 or self.rect.x > WIDTH or 
@@ -2,115 +2,193 @@
 import pygame
 import math
 import random
+import itertools
+from spatial import blocked
+
+# desvios tentados quando o passo direto e os perpendiculares batem em obstáculo
+PROBE_ANGLES = (15, -15, 30, -30, 45, -45)
+PROBE_ROTATIONS = tuple((math.cos(math.radians(a)), math.sin(math.radians(a))) for a in PROBE_ANGLES)
+
+ENEMY_COLOR = (255, 0, 0)
+# cor enquanto pisca depois de levar tiro
+HIT_COLOR = (255, 255, 0)
+
+# id único de cada zumbi que nasce (reuso pelo pool ganha id novo); usado pela rede
+_uids = itertools.count(1)
 
 class Enemy(pygame.Rect):
+    __slots__ = ("uid", "pos", "speed", "hit_timer", "color", "hp", "alive",
+                 "prev_x", "prev_y", "vel_x", "vel_y", "coast_clear", "_swarm", "_slot")
+
+    # rect de rascunho dos testes de colisão (evita alocar um Rect por teste)
+    _probe = pygame.Rect(0, 0, 0, 0)
+
     def __init__(self, x, y, size, speed):
         super().__init__(x, y, size, size)
         self.pos = pygame.math.Vector2(float(x), float(y))
+        self.reset(x, y, size, speed)
+
+    def reset(self, x, y, size, speed):
+        """Reinicia o inimigo para reuso (pool)."""
+        self.uid = next(_uids)
+        self.x = x
+        self.y = y
+        self.width = size
+        self.height = size
+        self.pos.x = float(x)
+        self.pos.y = float(y)
         self.speed = speed
-        self.hit_timer = 0
-        self.color = (255, 0, 0)
+        # timers.Timer do piscar de dano em andamento (None = sem piscar)
+        self.hit_timer = None
+        self.color = ENEMY_COLOR
         self.hp = 1
-
-    def move_towards_player(self, player, enemies, obstacles=[]):
-        center = self.pos + pygame.math.Vector2(self.width / 2, self.height / 2)
-        target = pygame.math.Vector2(player.centerx, player.centery)
-        to_target = target - center
-
-        if to_target.length_squared() < 0.01:
+        self.alive = True
+        self.prev_x = x
+        self.prev_y = y
+        # último deslocamento do steering (usado pelo LOD da IA em ailod.py)
+        self.vel_x = 0.0
+        self.vel_y = 0.0
+        # passos de coast que plan_coast garantiu longe de obstáculos
+        self.coast_clear = 0
+        # preenchidos quando o inimigo é uma view de swarm.Swarm
+        self._swarm = None
+        self._slot = -1
+
+    def move_towards_player(self, player, enemies, obstacles=[], grid=None, field=None, rng=random):
+        # tudo em floats: nenhum Vector2/Rect temporário por frame
+        pos = self.pos
+        cx = pos.x + self.width / 2
+        cy = pos.y + self.height / 2
+        tx = player.centerx - cx
+        ty = player.centery - cy
+        d2 = tx * tx + ty * ty
+
+        if d2 < 0.01:
             return
 
-        direction = to_target.normalize()
-        desired = direction * self.speed
-
-        separation = pygame.math.Vector2(0, 0)
-        for other in enemies:
+        # com campo de fluxo segue o caminho em volta dos obstáculos;
+        # fora da grade (ou na célula do player) vai direto
+        i = field.cell_index(cx, cy) if field is not None else -1
+        if i >= 0 and (field.dir_x[i] or field.dir_y[i]):
+            dx = field.dir_x[i]
+            dy = field.dir_y[i]
+        else:
+            dist = math.sqrt(d2)
+            dx = tx / dist
+            dy = ty / dist
+        speed = self.speed
+        vx = dx * speed
+        vy = dy * speed
+
+        # separação: com grid só visita as células vizinhas (senão, todos)
+        size = max(self.width, self.height)
+        neighbours = grid.nearby(cx, cy) if grid is not None else enemies
+        for other in neighbours:
             if other is self:
                 continue
-            other_center = pygame.math.Vector2(other.x + other.width/2, other.y + other.height/2)
-            offset = center - other_center
-            dist = offset.length()
-            if dist > 0 and dist < max(self.width, self.height):
-                separation += (offset.normalize() * (max(self.width, self.height) - dist) * 0.02)
-
-        desired += separation
-
-        def test_rect_at(pos_vec):
-            return pygame.Rect(int(pos_vec.x), int(pos_vec.y), self.width, self.height)
-
-        new_pos = self.pos + desired
-        test_rect = test_rect_at(new_pos)
-        if not any(test_rect.colliderect(obs) for obs in obstacles):
-            self.pos = new_pos
-            self._sync_rect()
+            ox = cx - (other.x + other.width / 2)
+            oy = cy - (other.y + other.height / 2)
+            d2 = ox * ox + oy * oy
+            if 0 < d2 < size * size:
+                dist = math.sqrt(d2)
+                k = (size - dist) * 0.02 / dist
+                vx += ox * k
+                vy += oy * k
+
+        if self._try_move(pos.x + vx, pos.y + vy, obstacles):
             return
 
-        perp = pygame.math.Vector2(-desired.y, desired.x)
-        if perp.length_squared() > 0:
-            perp = perp.normalize() * self.speed * 0.6
-            sides = [perp, -perp] if random.random() < 0.5 else [-perp, perp]
-            for s in sides:
-                np2 = self.pos + s
-                tr2 = test_rect_at(np2)
-                if not any(tr2.colliderect(obs) for obs in obstacles):
-                    self.pos = np2
-                    self._sync_rect()
-                    return
-
-        for angle in (15, -15, 30, -30, 45, -45):
-            alt = desired.rotate(angle)
-            np3 = self.pos + alt
-            tr3 = test_rect_at(np3)
-            if not any(tr3.colliderect(obs) for obs in obstacles):
-                self.pos = np3
-                self._sync_rect()
+        plen = math.hypot(vx, vy)
+        if plen > 0:
+            k = speed * 0.6 / plen
+            sx = -vy * k
+            sy = vx * k
+            if rng.random() >= 0.5:
+                sx, sy = -sx, -sy
+            if self._try_move(pos.x + sx, pos.y + sy, obstacles):
+                return
+            if self._try_move(pos.x - sx, pos.y - sy, obstacles):
                 return
 
-        self.pos -= desired * 0.5
+        for c, s in PROBE_ROTATIONS:
+            if self._try_move(pos.x + vx * c - vy * s, pos.y + vx * s + vy * c, obstacles):
+                return
+
+        pos.x -= vx * 0.5
+        pos.y -= vy * 0.5
+        self._sync_rect()
+
+    def plan_coast(self, ticks, obstacles):
+        """Depois do steering: vê se os próximos `ticks` passos de coast passam longe
+        de obstáculos (aí coast() não precisa testar colisão nesses passos)."""
+        m = int((abs(self.vel_x) + abs(self.vel_y)) * ticks) + 1
+        probe = Enemy._probe
+        probe.update(self.x - m, self.y - m, self.width + 2 * m, self.height + 2 * m)
+        self.coast_clear = 0 if blocked(obstacles, probe) else ticks
+
+    def coast(self, obstacles):
+        """Entre atualizações de IA (LOD): repete o último deslocamento, sem steering."""
+        if self.coast_clear > 0:
+            # dentro da janela checada por plan_coast; depois dela volta a testar
+            self.coast_clear -= 1
+            pos = self.pos
+            pos.x += self.vel_x
+            pos.y += self.vel_y
+            self._sync_rect()
+        elif self.vel_x or self.vel_y:
+            if not self._try_move(self.pos.x + self.vel_x, self.pos.y + self.vel_y, obstacles):
+                self.vel_x = 0.0
+                self.vel_y = 0.0
+
+    def _try_move(self, nx, ny, obstacles):
+        probe = Enemy._probe
+        probe.x = int(nx)
+        probe.y = int(ny)
+        probe.width = self.width
+        probe.height = self.height
+        if blocked(obstacles, probe):
+            return False
+        self.pos.x = nx
+        self.pos.y = ny
         self._sync_rect()
+        return True
 
     def _sync_rect(self):
         self.x = int(self.pos.x)
         self.y = int(self.pos.y)
 
     @staticmethod
-    def spawn(size, speed, width, height, existing):
-        for _ in range(50):
-            side = random.choice(["top", "left", "right", "bottom"])
-            if side == "top":
-                x = random.randint(0, width - size)
-                y = -size
-            elif side == "bottom":
-                x = random.randint(0, width - size)
-                y = height
-            elif side == "left":
-                x = -size
-                y = random.randint(0, height - size)
-            else:
-                x = width
-                y = random.randint(0, height - size)
-
-            new_enemy = Enemy(x, y, size, speed)
-            if not any(new_enemy.colliderect(e) for e in existing):
-                return new_enemy
-        return None
+    def spawn(size, speed, slots, pool=None, rng=random):
+        """Zumbi numa vaga livre de slots (placement.EdgeSpawner); ArenaFull se não houver."""
+        x, y = slots.take(rng)
+        if pool is not None:
+            return pool.acquire(x, y, size, speed)
+        return Enemy(x, y, size, speed)
 
     def hit_react(self, bx, by):
+        if self._swarm is not None:
+            return self._swarm.hit(self._slot, bx, by)
         self.hp -= 1
         dx = (self.pos.x) - bx
         dy = (self.pos.y) - by
         dist = max(math.hypot(dx, dy), 1)
         self.pos.x += (dx / dist) * 40
         self.pos.y += (dy / dist) * 40
-
-        self.hit_timer = 6
-        self.color = (255, 255, 0)
         self._sync_rect()
         return self.hp <= 0
 
+    def flash(self, timers, duration):
+        """Pisca com HIT_COLOR por `duration` ms do relógio de timers (timers.Scheduler)."""
+        if self.hit_timer is not None:
+            self.hit_timer.cancel()
+        self.color = HIT_COLOR
+        self.hit_timer = timers.after(duration, self.end_flash, self.uid)
+
+    def end_flash(self, uid):
+        # o timer pode vencer depois de o zumbi voltar ao pool e renascer com outro uid
+        if self.uid == uid:
+            self.color = ENEMY_COLOR
+            self.hit_timer = None
+
     def draw(self, screen):
         pygame.draw.rect(screen, self.color, self)
-        if self.hit_timer > 0:
-            self.hit_timer -= 1
-            if self.hit_timer == 0:
-                self.color = (255, 0, 0)
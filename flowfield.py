@@ -0,0 +1,136 @@
+# flowfield.py
+import heapq
+import math
+from collections import OrderedDict
+
+import pygame
+
+from spatial import blocked
+
+SQRT2 = math.sqrt(2)
+# vizinhos (dx, dy, custo); diagonais só passam se os dois lados estão livres
+NEIGHBOURS = ((1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+              (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2))
+
+
+class FlowField:
+    """
+    Campo de fluxo em grade até o player: um Dijkstra a partir da célula do
+    player sobre o layout de obstáculos dá, para cada célula, a direção do
+    próximo passo. Só é recalculado quando o player muda de célula e é
+    compartilhado por todos os zumbis (amostrar é O(1)).
+    """
+
+    def __init__(self, width, height, cell_size, cache_size=64):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        n = self.cols * self.rows
+        self.walls = bytearray(n)
+        self.dist = [math.inf] * n
+        self.dir_x = [0.0] * n
+        self.dir_y = [0.0] * n
+        self.target = None
+        self.version = 0
+        # campos já calculados por célula alvo (LRU): player indo e voltando
+        # entre duas células não refaz o Dijkstra
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self._link()
+
+    def set_obstacles(self, obstacles):
+        """Marca como parede toda célula que encosta em obstáculo (lista ou ObstacleIndex)."""
+        cs = self.cell_size
+        cell = pygame.Rect(0, 0, cs, cs)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                cell.topleft = (col * cs, row * cs)
+                self.walls[row * self.cols + col] = 1 if blocked(obstacles, cell) else 0
+        self._link()
+        self.cache.clear()
+        self.target = None
+
+    def _link(self):
+        # vizinhos alcançáveis de cada célula, com custo e a direção de volta;
+        # só muda com o layout, então o Dijkstra não refaz esses testes
+        cols, rows = self.cols, self.rows
+        walls = self.walls
+        links = []
+        for i in range(cols * rows):
+            row, col = divmod(i, cols)
+            out = []
+            for dx, dy, cost in NEIGHBOURS:
+                c, r = col + dx, row + dy
+                if c < 0 or c >= cols or r < 0 or r >= rows:
+                    continue
+                j = r * cols + c
+                if walls[j]:
+                    continue
+                if dx and dy and (walls[row * cols + c] or walls[r * cols + col]):
+                    continue
+                out.append((j, cost, -dx / cost, -dy / cost))
+            links.append(tuple(out))
+        self.links = links
+
+    def cell_index(self, x, y):
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def update(self, x, y):
+        """Recalcula o campo se (x, y) caiu numa célula nova. Retorna True se recalculou."""
+        target = self.cell_index(x, y)
+        if target == self.target or target < 0:
+            return False
+        self.target = target
+        cached = self.cache.get(target)
+        if cached is not None:
+            self.cache.move_to_end(target)
+            self.dist, self.dir_x, self.dir_y = cached
+        else:
+            self._compute(target)
+            self.cache[target] = (self.dist, self.dir_x, self.dir_y)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        self.version += 1
+        return True
+
+    def _compute(self, target):
+        # Dijkstra; a direção de cada célula aponta para o "pai" dela na árvore
+        # de caminhos mínimos, então sai no mesmo laço
+        links = self.links
+        n = self.cols * self.rows
+        dist = [math.inf] * n
+        dir_x = [0.0] * n
+        dir_y = [0.0] * n
+        dist[target] = 0.0
+        heap = [(0.0, target)]
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            d, i = pop(heap)
+            if d > dist[i]:
+                continue
+            for j, cost, bx, by in links[i]:
+                nd = d + cost
+                if nd < dist[j]:
+                    dist[j] = nd
+                    dir_x[j] = bx
+                    dir_y[j] = by
+                    push(heap, (nd, j))
+        self.dist = dist
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+
+    def direction(self, x, y):
+        """Direção unitária (dx, dy) a seguir em (x, y), ou None (fora da grade,
+        célula do player ou sem caminho) — nesse caso vale ir direto ao player."""
+        i = self.cell_index(x, y)
+        if i < 0:
+            return None
+        dx = self.dir_x[i]
+        dy = self.dir_y[i]
+        if dx == 0.0 and dy == 0.0:
+            return None
+        return dx, dy
@@ -1,12 +1,537 @@
-class Game:
-    def __init__(self):
-        self.player = Player(...)
-        self.enemies = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
-        self.state = "GAMEPLAY"
-
-    def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
+# game.py
+# Simulação de uma partida, sem depender de tela, teclado ou som: todo o
+# estado vive numa instância de Game. O main.py desenha e lê o input; o
+# batch.py roda milhares de partidas em paralelo com um bot.
+import hashlib
+import math
+import random
+from array import array
+
+import pygame
+
+from player import Player
+from enemy import Enemy
+from bullet import Bullet
+from spatial import SpatialHash, ObstacleIndex, compact, sweep
+from flowfield import FlowField
+from pool import Pool, AllocationStats
+from profiler import Profiler
+from ailod import AIScheduler, LOD_BANDS
+from placement import EdgeSpawner, SlotList, ArenaFull, grid_cells
+from timers import Scheduler
+import swarm
+
+# ---------------------------
+# Constantes / Configurações
+# ---------------------------
+# simulação em passo fixo, independente do FPS de renderização
+TICK_RATE = 60
+TICK_MS = 1000.0 / TICK_RATE
+
+PLAYER_SIZE = 50
+PLAYER_SPEED = 5
+PLAYER_START_LIFE = 3
+# co-op: onde cada player nasce, em múltiplos de PLAYER_SIZE a partir do centro
+PLAYER_SPAWN_OFFSETS = ((0, 0), (-2, 0), (2, 0), (0, 2))
+MAX_PLAYERS = len(PLAYER_SPAWN_OFFSETS)
+
+ENEMY_SIZE = 40
+ENEMY_SPEED_INIT = 1.0
+
+BULLET_SIZE = 10
+BULLET_SPEED = 10
+
+BOX_SIZE = 50
+# caixas: no máximo uma por célula BOX_PITCH x BOX_PITCH da arena
+BOX_PITCH = BOX_SIZE * 2
+OBSTACLES_COUNT = 10
+
+MAX_SHOTS = 10
+RELOAD_TIME_MS = 2000
+# zumbi atingido (e que não morreu) pisca por esse tempo
+HIT_FLASH_MS = 100
+
+ENEMIES_TO_SPAWN_INIT = 20
+MAX_WAVES = 4
+# wave n tem WAVE_SPAWN_BASE + n * WAVE_SPAWN_PER_WAVE inimigos e cada wave
+# nova fica ENEMY_SPEED_STEP mais rápida
+WAVE_SPAWN_BASE = 5
+WAVE_SPAWN_PER_WAVE = 7
+ENEMY_SPEED_STEP = 0.20
+
+# move a horda com o motor vetorizado de swarm.py (precisa do numpy)
+SWARM_ENGINE = False
+
+# LOD da IA (ailod.py): zumbis longe do player fazem steering a cada k ticks.
+# O modo adaptativo mede tempo real, então replays gravados com ele divergem
+AI_LOD = True
+AI_LOD_BANDS = LOD_BANDS
+AI_LOD_ADAPTIVE = False
+
+
+class Game:
+    """
+    Uma partida. apply() avança um tick com um TickInput (step() e shoot()
+    são as partes dele). Sons e outros efeitos saem como nomes em `events`
+    (ex.: "pistol", "reload") para quem desenha. Os parâmetros das waves são
+    configuráveis para o ajuste via batch.py.
+
+    Toda a aleatoriedade sai de streams próprias semeadas por `seed`: mesma
+    seed, mesmos parâmetros e mesmos inputs dão a mesma partida (replay.py).
+
+    Com players > 1 (co-op, net.py) apply_all() recebe um TickInput por
+    player; cada zumbi persegue o player vivo mais perto e a partida só
+    acaba quando todos morrem. `player` é sempre players[0].
+    """
+
+    def __init__(self, width, height, seed=None,
+                 spawn_init=ENEMIES_TO_SPAWN_INIT,
+                 spawn_base=WAVE_SPAWN_BASE,
+                 spawn_per_wave=WAVE_SPAWN_PER_WAVE,
+                 speed_init=ENEMY_SPEED_INIT,
+                 speed_step=ENEMY_SPEED_STEP,
+                 max_waves=MAX_WAVES,
+                 obstacles_count=OBSTACLES_COUNT,
+                 swarm_engine=SWARM_ENGINE,
+                 ai_lod=AI_LOD,
+                 ai_adaptive=AI_LOD_ADAPTIVE,
+                 players=1):
+        if not 1 <= players <= MAX_PLAYERS:
+            raise ValueError(f"players deve ser de 1 a {MAX_PLAYERS}")
+        if players > 1 and swarm_engine:
+            raise ValueError("o motor de swarm só persegue um player")
+        self.width = width
+        self.height = height
+        self.spawn_init = spawn_init
+        self.spawn_base = spawn_base
+        self.spawn_per_wave = spawn_per_wave
+        self.speed_init = speed_init
+        self.speed_step = speed_step
+        self.max_waves = max_waves
+        self.obstacles_count = obstacles_count
+        self.swarm_engine = swarm_engine
+        self.ai_lod = ai_lod
+        self.ai_adaptive = ai_adaptive
+        self.num_players = players
+
+        self.enemies = []
+        self.bullets = []
+        self.obstacles = []
+        self.events = []
+
+        # índice estático dos obstáculos (refeito a cada layout em spawn_obstacles)
+        self.obstacle_index = ObstacleIndex(BOX_SIZE)
+        # muda a cada layout novo, para quem desenha saber que precisa redesenhar
+        self.layout_version = 0
+
+        # campo de fluxo até o player, compartilhado por todos os zumbis
+        self.flow_field = FlowField(width, height, ENEMY_SIZE)
+        # co-op: um campo por player (o primeiro é o flow_field)
+        self.flow_fields = [self.flow_field] + [FlowField(width, height, ENEMY_SIZE)
+                                                for _ in range(players - 1)]
+
+        # pools: balas e inimigos mortos são reaproveitados em vez de realocados
+        self.bullet_pool = Pool(Bullet)
+        self.enemy_pool = Pool(Enemy)
+        self.alloc_stats = AllocationStats({"bullets": self.bullet_pool, "enemies": self.enemy_pool})
+
+        # grid dos inimigos: vizinhança na separação e broadphase das balas
+        self.enemy_grid = SpatialHash(ENEMY_SIZE)
+        # vagas de spawn fora da tela, em faixas em volta das bordas
+        self.edge_spawner = EdgeSpawner(width, height, ENEMY_SIZE)
+        self.enemy_swarm = swarm.Swarm(ENEMY_SIZE) if swarm_engine and swarm.available() else None
+        self.ai_scheduler = AIScheduler(AI_LOD_BANDS, ai_adaptive) if ai_lod else None
+
+        # tempos por fase do update; desligado por padrão (o main.py troca pelo dele)
+        self.profiler = Profiler(enabled=False)
+
+        self.reseed(seed)
+        self.reset()
+
+    @property
+    def params(self):
+        """Parâmetros de construção (menos tamanho e seed), para batch.py e replays."""
+        return {
+            "spawn_init": self.spawn_init,
+            "spawn_base": self.spawn_base,
+            "spawn_per_wave": self.spawn_per_wave,
+            "speed_init": self.speed_init,
+            "speed_step": self.speed_step,
+            "max_waves": self.max_waves,
+            "obstacles_count": self.obstacles_count,
+            "swarm_engine": self.swarm_engine,
+            "ai_lod": self.ai_lod,
+            "ai_adaptive": self.ai_adaptive,
+            "players": self.num_players,
+        }
+
+    def reseed(self, seed=None):
+        """Recria as streams aleatórias (layout, spawn e IA) a partir de `seed`."""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng_layout = random.Random(f"{seed}/layout")
+        self.rng_spawn = random.Random(f"{seed}/spawn")
+        self.rng_ai = random.Random(f"{seed}/ai")
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.reseed(seed)
+
+    # ---------------------------
+    # Mundo
+    # ---------------------------
+    def reset(self):
+        # as streams aleatórias continuam de onde estavam: reiniciar também é determinístico
+        # relógio da simulação (ms); avança TICK_MS por passo, não pelo relógio real
+        self.sim_time = 0.0
+        # timers no relógio da simulação (recarga, invencibilidade, piscar de dano)
+        self.timers = Scheduler()
+        self.players = [Player(x, y, PLAYER_SIZE, PLAYER_SPEED)
+                        for x, y in self.player_spawns()]
+        self.player = self.players[0]
+        self.bullet_pool.release_all(self.bullets)
+        self.enemy_pool.release_all(self.enemies)
+        self.events.clear()
+
+        self.game_over = False
+        self.game_win = False
+        self.kill_count = 0
+        self.kills_per_wave = [0]
+        self.damage_taken = 0
+        # tiros de todos os players e quantos acertaram zumbi (precisão no placar)
+        self.shots_total = 0
+        self.hits = 0
+
+        self.wave = 1
+        self.enemy_speed = self.speed_init
+        self.enemies_to_spawn = self.spawn_init
+
+        self.spawn_obstacles(self.obstacles_count)
+        self.init_enemies()
+
+    def spawn_obstacles(self, num=OBSTACLES_COUNT):
+        obstacles = self.obstacles
+        index = self.obstacle_index
+        rng = self.rng_layout
+        obstacles.clear()
+        index.clear()
+        self.layout_version += 1
+        spawns = [pygame.Rect(x, y, PLAYER_SIZE, PLAYER_SIZE) for x, y in self.player_spawns()]
+        player_area = spawns[0].unionall(spawns[1:])
+        cells = SlotList(grid_cells(self.width, self.height, BOX_PITCH, player_area))
+        if num > len(cells):
+            raise ArenaFull(f"{num} caixas não cabem numa arena {self.width}x{self.height} "
+                            f"(máximo {len(cells)})")
+        slack = BOX_PITCH - BOX_SIZE
+        for _ in range(num):
+            cx, cy = cells.take(rng)
+            new_box = pygame.Rect(cx + rng.randint(0, slack), cy + rng.randint(0, slack),
+                                  BOX_SIZE, BOX_SIZE)
+            obstacles.append(new_box)
+            index.add(new_box)
+        for field in self.flow_fields:
+            field.set_obstacles(index)
+
+    def init_enemies(self):
+        enemies = self.enemies
+        self.enemy_pool.release_all(enemies)
+        spawner = self.edge_spawner
+        spawner.reset()
+        for _ in range(self.enemies_to_spawn):
+            enemies.append(Enemy.spawn(ENEMY_SIZE, self.enemy_speed, spawner,
+                                       self.enemy_pool, self.rng_spawn))
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.set_obstacles(self.obstacles)
+            self.enemy_swarm.attach(enemies)
+
+    def compact_enemies(self):
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.compact(self.enemy_pool)
+        else:
+            compact(self.enemies, self.enemy_pool)
+
+    def player_spawns(self):
+        cx = self.width // 2
+        cy = self.height // 2
+        return [(cx + ox * PLAYER_SIZE, cy + oy * PLAYER_SIZE)
+                for ox, oy in PLAYER_SPAWN_OFFSETS[:self.num_players]]
+
+    @property
+    def finished(self):
+        return self.game_over or self.game_win
+
+    # munição do player local (players[0]), para HUD, hash e snapshots
+    @property
+    def shots_fired(self):
+        return self.player.shots_fired
+
+    @property
+    def reloading(self):
+        return self.player.reloading
+
+    def alive_players(self):
+        return [p for p in self.players if p.life > 0]
+
+    # ---------------------------
+    # Ações
+    # ---------------------------
+    def shoot(self, target_x, target_y, player=None):
+        """Dispara do player (padrão: o local) em direção a (target_x, target_y).
+        Retorna True se saiu bala."""
+        p = self.player if player is None else player
+        if self.finished or p.reloading or p.life <= 0:
+            return False
+        fired = False
+        if p.shots_fired < MAX_SHOTS:
+            self.bullets.append(self.bullet_pool.acquire(p.centerx, p.centery, target_x, target_y,
+                                                         BULLET_SIZE, BULLET_SPEED))
+            p.shots_fired += 1
+            self.shots_total += 1
+            if p is self.player:
+                self.events.append("pistol")
+            fired = True
+        if p.shots_fired >= MAX_SHOTS:
+            p.reloading = True
+            self.timers.after(RELOAD_TIME_MS, p.finish_reload)
+            if p is self.player:
+                self.events.append("reload")
+        return fired
+
+    # ---------------------------
+    # Update
+    # ---------------------------
+    def apply(self, inp, dt=TICK_MS):
+        """Um tick completo a partir de um inputs.TickInput."""
+        if inp.restart:
+            self.reset()
+        if inp.fire:
+            self.shoot(inp.aim_x, inp.aim_y)
+        self.step((inp.dx, inp.dy), dt)
+
+    def apply_all(self, inputs, dt=TICK_MS):
+        """Um tick co-op: inputs[i] (TickInput) é do players[i]; restart não vale aqui."""
+        for player, inp in zip(self.players, inputs):
+            if inp.fire:
+                self.shoot(inp.aim_x, inp.aim_y, player)
+        self.step(moves=[(inp.dx, inp.dy) for inp in inputs], dt=dt)
+
+    def step(self, move=(0, 0), dt=TICK_MS, moves=None):
+        """Avança um passo fixo. move: direção (dx, dy) do player; moves: uma
+        direção por player (co-op)."""
+        self.alloc_stats.begin_frame()
+        self.sim_time += dt
+        self.remember_positions()
+        self.timers.advance(dt)
+
+        if not self.finished:
+            section = self.profiler.section
+            with section("update.player"):
+                if moves is None:
+                    self.update_player(move)
+                else:
+                    for player, m in zip(self.players, moves):
+                        self.update_player(m, player)
+            with section("update.enemies"):
+                self.update_enemies()
+            with section("update.bullets"):
+                self.update_bullets()
+            with section("update.waves"):
+                self.update_waves()
+            if self.finished:
+                # a partida acabou neste tick (main.py registra no placar)
+                self.events.append("run_end")
+        self.alloc_stats.end_frame()
+
+    def remember_positions(self):
+        # posição do passo anterior, usada na interpolação do draw
+        for player in self.players:
+            player.prev_x, player.prev_y = player.x, player.y
+        for enemy in self.enemies:
+            enemy.prev_x, enemy.prev_y = enemy.x, enemy.y
+        for bullet in self.bullets:
+            bullet.prev_x, bullet.prev_y = bullet.x, bullet.y
+
+    def update_player(self, move=(0, 0), player=None):
+        if player is None:
+            player = self.player
+        if player.life <= 0:
+            return
+        player.set_direction(*move)
+        player.move_and_collide(self.obstacle_index, self.width, self.height)
+
+    def update_enemies(self):
+        if self.num_players > 1:
+            self.update_enemies_coop()
+            return
+        player = self.player
+        # inimigos se movendo (mortos viram tombstone e saem no compact)
+        with self.profiler.section("update.enemies.flow"):
+            self.flow_field.update(player.centerx, player.centery)
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.step(player, self.flow_field)
+            touching = self.enemy_swarm.touching(player)
+        else:
+            enemies = self.enemies
+            obstacles = self.obstacle_index
+            grid = self.enemy_grid
+            field = self.flow_field
+            rng = self.rng_ai
+            grid.rebuild(enemies)
+            if self.ai_scheduler is not None:
+                self.ai_scheduler.update(
+                    enemies, player,
+                    lambda enemy: enemy.move_towards_player(player, enemies, obstacles, grid, field, rng),
+                    obstacles)
+            else:
+                for enemy in enemies:
+                    enemy.move_towards_player(player, enemies, obstacles, grid, field, rng)
+            touching = [enemy for enemy in enemies if player.colliderect(enemy)]
+
+        for enemy in touching:
+            self.hurt(player)
+            if player.life <= 0:
+                self.game_over = True
+            # remove o inimigo que bateu no player
+            enemy.alive = False
+        self.compact_enemies()
+
+    def hurt(self, player):
+        # invencível por invincible_cooldown ms depois do dano, no relógio da simulação
+        if player.take_damage():
+            self.damage_taken += 1
+            if player is self.player:
+                self.events.append("hurt")
+            self.timers.after(player.invincible_cooldown, player.end_invincible)
+
+    def update_enemies_coop(self):
+        # co-op: cada zumbi segue o campo de fluxo do player vivo mais perto
+        targets = [(p, f) for p, f in zip(self.players, self.flow_fields) if p.life > 0]
+        if not targets:
+            return
+        with self.profiler.section("update.enemies.flow"):
+            for p, f in targets:
+                f.update(p.centerx, p.centery)
+        enemies = self.enemies
+        obstacles = self.obstacle_index
+        grid = self.enemy_grid
+        rng = self.rng_ai
+        grid.rebuild(enemies)
+
+        def steer(enemy):
+            cx = enemy.centerx
+            cy = enemy.centery
+            best = targets[0]
+            best_d2 = math.inf
+            for target in targets:
+                p = target[0]
+                dx = p.centerx - cx
+                dy = p.centery - cy
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best = target
+            enemy.move_towards_player(best[0], enemies, obstacles, grid, best[1], rng)
+
+        if self.ai_scheduler is not None:
+            players = [p for p, _ in targets]
+            self.ai_scheduler.update(enemies, players[0], steer, obstacles, players[1:])
+        else:
+            for enemy in enemies:
+                steer(enemy)
+
+        for player, _ in targets:
+            for enemy in enemies:
+                if enemy.alive and player.colliderect(enemy):
+                    self.hurt(player)
+                    enemy.alive = False
+        if not self.alive_players():
+            self.game_over = True
+        self.compact_enemies()
+
+    def update_bullets(self):
+        # balas: o caminho do passo inteiro (não só a posição final) é testado
+        # contra inimigos e obstáculos das células que ele cobre, e vale o
+        # primeiro contato; bala rápida não atravessa zumbi entre dois ticks
+        grid = self.enemy_grid
+        grid.rebuild(self.enemies)
+        obstacles = self.obstacle_index
+        for bullet in self.bullets:
+            x0 = bullet.x
+            y0 = bullet.y
+            half = bullet.rect.width / 2
+            dx = bullet.vel_x
+            dy = bullet.vel_y
+            bullet.move()
+            swept = bullet.swept_rect(x0, y0)
+            cx = x0 + half
+            cy = y0 + half
+
+            first_t = 2.0
+            target = None
+            for enemy in grid.query_rect(swept):
+                if enemy.alive and swept.colliderect(enemy):
+                    t = sweep(cx, cy, dx, dy, enemy, half)
+                    if t is not None and t < first_t:
+                        first_t = t
+                        target = enemy
+            for obstacle in obstacles.candidates(swept):
+                if swept.colliderect(obstacle):
+                    t = sweep(cx, cy, dx, dy, obstacle, half)
+                    if t is not None and t < first_t:
+                        first_t = t
+                        target = obstacle
+
+            if target is not None:
+                bullet.alive = False
+                bullet.place(x0 + dx * first_t, y0 + dy * first_t)
+                if isinstance(target, Enemy):
+                    self.hits += 1
+                    if target.hit_react(bullet.x, bullet.y):
+                        target.alive = False
+                        self.kill_count += 1
+                        self.kills_per_wave[-1] += 1
+                    else:
+                        target.flash(self.timers, HIT_FLASH_MS)
+            elif bullet.offscreen(self.width, self.height):
+                bullet.alive = False
+        compact(self.bullets, self.bullet_pool)
+        self.compact_enemies()
+
+    def update_waves(self):
+        if len(self.enemies) == 0:
+            self.wave += 1
+            if self.wave > self.max_waves:
+                self.game_win = True
+            else:
+                self.enemies_to_spawn = int(self.spawn_base + (self.wave * self.spawn_per_wave))
+                self.enemy_speed += self.speed_step
+                self.kills_per_wave.append(0)
+                self.init_enemies()
+
+    # ---------------------------
+    # Resultado
+    # ---------------------------
+    def state_hash(self):
+        """Hash de 64 bits do estado da simulação, para conferir replays."""
+        p = self.player
+        values = array("d", (self.sim_time, p.x, p.y, p.life, self.kill_count, self.wave,
+                             self.shots_fired, self.reloading, len(self.enemies), len(self.bullets)))
+        for e in self.enemies:
+            values.extend((e.x, e.y, e.hp))
+        for b in self.bullets:
+            values.extend((b.x, b.y))
+        for p in self.players[1:]:
+            values.extend((p.x, p.y, p.life))
+        return int.from_bytes(hashlib.blake2b(values.tobytes(), digest_size=8).digest(), "little")
+
+    def summary(self):
+        return {
+            "won": self.game_win,
+            "lost": self.game_over,
+            "survival_s": self.sim_time / 1000.0,
+            "wave": min(self.wave, self.max_waves),
+            "kills": self.kill_count,
+            "kills_per_wave": list(self.kills_per_wave),
+            "damage_taken": self.damage_taken,
+            "shots": self.shots_total,
+            "hits": self.hits,
+        }
@@ -0,0 +1,67 @@
+# hud.py
+from collections import OrderedDict
+
+import pygame
+
+RED = (255, 0, 0)
+BLACK = (0, 0, 0)
+
+
+class TextCache:
+    """Cache LRU de textos renderizados, por (texto, cor, fonte)."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (text, color, id(font))
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+
+class Hud:
+    """
+    HUD composto numa única surface (corações, kills, wave e "Recarregando...").
+    Só é refeito quando vida, kills, wave ou estado de recarga mudam.
+    """
+
+    def __init__(self, width, font, heart_img, text_cache):
+        self.width = width
+        self.font = font
+        self.heart_img = heart_img
+        self.text_cache = text_cache
+        self.key = None
+        self.surface = None
+        self.pos = (0, 0)
+
+    def overlay(self, life, kill_count, wave, reloading):
+        key = (life, kill_count, wave, reloading)
+        if key != self.key:
+            self._compose(life, kill_count, wave, reloading)
+            self.key = key
+        return self.surface, self.pos
+
+    def _compose(self, life, kill_count, wave, reloading):
+        render = self.text_cache.render
+        items = [(self.heart_img, (10 + i * 35, 10)) for i in range(life)]
+        items.append((render(self.font, f"Inimigos mortos: {kill_count}", BLACK), (10, 50)))
+        items.append((render(self.font, f"Wave: {wave}", BLACK), (10, 90)))
+        if reloading:
+            reload_text = render(self.font, "Recarregando...", RED)
+            items.append((reload_text, (self.width // 2 - reload_text.get_width() // 2, 10)))
+
+        bounds = pygame.Rect(items[0][1], items[0][0].get_size())
+        bounds.unionall_ip([pygame.Rect(pos, surf.get_size()) for surf, pos in items])
+        overlay = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for surf, (x, y) in items:
+            overlay.blit(surf, (x - bounds.x, y - bounds.y))
+        self.surface = overlay
+        self.pos = bounds.topleft
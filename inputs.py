@@ -0,0 +1,52 @@
+# inputs.py
+# Input de um tick da simulação, independente de onde veio (teclado e mouse,
+# bot ou replay). O Game só enxerga TickInput, então uma partida gravada
+# pode ser refeita tick a tick.
+import pygame
+
+
+class TickInput:
+    """
+    dx, dy: direção do movimento (-1, 0 ou 1 em cada eixo);
+    fire: atirar neste tick, mirando em (aim_x, aim_y);
+    restart: reiniciar a partida antes do tick.
+    """
+    __slots__ = ("dx", "dy", "fire", "aim_x", "aim_y", "restart")
+
+    def __init__(self, dx=0, dy=0, fire=False, aim_x=0, aim_y=0, restart=False):
+        self.dx = dx
+        self.dy = dy
+        self.fire = fire
+        self.aim_x = aim_x
+        self.aim_y = aim_y
+        self.restart = restart
+
+
+IDLE = TickInput()
+
+
+class KeyboardInput:
+    """
+    Input ao vivo: WASD em cada tick; clique e R chegam como eventos (uma vez
+    por frame) e ficam guardados até o próximo tick consumir.
+    """
+
+    def __init__(self):
+        self.fire = None
+        self.restart = False
+
+    def on_event(self, event, finished):
+        if event.type == pygame.MOUSEBUTTONDOWN and not finished:
+            self.fire = pygame.mouse.get_pos()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_r and finished:
+                self.restart = True
+
+    def next(self):
+        keys = pygame.key.get_pressed()
+        dx = 1 if keys[pygame.K_d] else -1 if keys[pygame.K_a] else 0
+        dy = 1 if keys[pygame.K_s] else -1 if keys[pygame.K_w] else 0
+        inp = TickInput(dx, dy, self.fire is not None, *(self.fire or (0, 0)), self.restart)
+        self.fire = None
+        self.restart = False
+        return inp
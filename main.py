@@ -1,86 +1,80 @@
 import os
 import sys
-import pygame
-import random
-import math
-from player import Player
-from enemy import Enemy
-from bullet import Bullet
 
-# ---------------------------
-# Asset path util (no arquivo extra)
-# ---------------------------
-def asset_path(filename):
-    """
-    Retorna caminho correto para assets:
-    - quando empacotado pelo PyInstaller -> usa sys._MEIPASS
-    - quando roda em .py -> usa o diretório do arquivo main.py
-    """
-    if hasattr(sys, "_MEIPASS"):
-        base = sys._MEIPASS
-    else:
-        base = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base, filename)
+# modo headless: simula sem janela (driver dummy do SDL), o mais rápido possível.
+# também vale quando quem importa já escolheu o driver dummy (ex.: benchmarks).
+# precisa vir antes do import do pygame
+HEADLESS = "--headless" in sys.argv or "--build-assets" in sys.argv or os.environ.get("SDL_VIDEODRIVER") == "dummy"
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 
-# ---------------------------
-# Safe loaders
-# ---------------------------
-def safe_load_image(path, convert_alpha=True):
-    full = asset_path(path)
-    try:
-        img = pygame.image.load(full)
-        return img.convert_alpha() if convert_alpha else img.convert()
-    except Exception as e:
-        print(f"[WARN] Falha ao carregar imagem '{path}': {e} (tentado: {full})")
-        surf = pygame.Surface((32, 32), pygame.SRCALPHA)
-        surf.fill((255, 0, 255, 128))
-        return surf
-
-def safe_load_sound(path):
-    full = asset_path(path)
-    try:
-        return pygame.mixer.Sound(full)
-    except Exception as e:
-        print(f"[WARN] Falha ao carregar som '{path}': {e} (tentado: {full})")
-        class Silent:
-            def play(self, *a, **k): pass
-            def set_volume(self, *a, **k): pass
-        return Silent()
+import pygame
+import math
+import time
+import argparse
+import json
+from game import (Game, TICK_RATE, TICK_MS, PLAYER_SIZE, PLAYER_START_LIFE,
+                  ENEMY_SIZE, BOX_SIZE, BULLET_SIZE)
+from rotcache import RotationCache
+from render import DirtyRenderer, SpriteBatch
+from pipeline import SimThread, capture
+from hud import Hud, TextCache
+import assetpack
+from assets import AssetManager, asset_path
+import audio
+from inputs import KeyboardInput
+from replay import Recorder
+from profiler import Profiler
+from scores import ScoreStore, Run, TOP_N, format_run
 
 # ---------------------------
 # Inicialização Pygame
 # ---------------------------
 pygame.init()
-pygame.mixer.init()
+audio.init_mixer()
 
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+HEADLESS_SIZE = (1920, 1080)
+if HEADLESS:
+    screen = pygame.display.set_mode(HEADLESS_SIZE)
+else:
+    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
 WIDTH, HEIGHT = screen.get_size()
 pygame.display.set_caption("Top Down Shooter")
 
 clock = pygame.time.Clock()
-FPS = 60
+FPS = 60  # limite de frames desenhados (0 = sem limite)
+
+# a simulação roda em passo fixo (TICK_RATE, em game.py), independente do FPS
+MAX_FRAME_MS = 250  # evita "espiral da morte" depois de travadas longas
 
 # ---------------------------
 # Constantes / Configurações
 # ---------------------------
-PLAYER_SIZE = 50
-PLAYER_SPEED = 5
-PLAYER_START_LIFE = 3
+# ângulos pré-rotacionados por sprite (64 ou 128); lazy gera sob demanda
+ROTATION_STEPS = 64
+ROTATION_LAZY = True
 
-ENEMY_SIZE = 40
-ENEMY_SPEED_INIT = 1.0
+# redesenha só as áreas que mudaram (volta ao flip se a área suja for grande)
+DIRTY_RENDERING = True
+DIRTY_FULL_THRESHOLD = 0.35
 
-BULLET_SIZE = 10
-BULLET_SPEED = 10
+# profiler: F3 liga/desliga o overlay; histórico de frames do gráfico
+PROFILER_HISTORY = 240
 
-BOX_SIZE = 50
-OBSTACLES_COUNT = 10
+# troca de pose dos zumbis (segurando / em pé), pelo relógio da simulação
+ZOMBIE_SWITCH_MS = 3000
 
-MAX_SHOTS = 10
-RELOAD_TIME_MS = 2000
+# simulação numa thread própria, publicando snapshots para o render (--pipelined)
+PIPELINED = False
 
-ENEMIES_TO_SPAWN_INIT = 20
-MAX_WAVES = 4
+# linhas do placar local na tela de fim de partida
+SCORES_SHOWN = 5
+
+# camadas do SpriteBatch (0 embaixo)
+LAYER_PLAYER = 0
+LAYER_ZOMBIES = 1
+LAYER_BULLETS = 2
 
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -90,342 +84,477 @@ BLACK = (0, 0, 0)
 
 font = pygame.font.SysFont(None, 36)
 game_over_font = pygame.font.SysFont(None, 72)
+profiler_font = pygame.font.SysFont(None, 20)
 
 # ---------------------------
 # Assets (usando loaders seguros)
 # ---------------------------
-heart_img = safe_load_image("assets/heartDisplayFull.png")
-heart_img = pygame.transform.scale(heart_img, (32, 32))
-
-background = safe_load_image("assets/background.png", convert_alpha=False)
-background = pygame.transform.scale(background, (WIDTH, HEIGHT))
-
-player_img = safe_load_image("assets/soldier1_gun.png")
-player_img = pygame.transform.scale(player_img, (PLAYER_SIZE, PLAYER_SIZE))
-
-player_reload_img = safe_load_image("assets/soldier1_reload.png")
-player_reload_img = pygame.transform.scale(player_reload_img, (PLAYER_SIZE, PLAYER_SIZE))
-
-box_img = safe_load_image("assets/tile_129.png")
-box_img = pygame.transform.scale(box_img, (BOX_SIZE, BOX_SIZE))
-
-zombie_hold_img = safe_load_image("assets/zoimbie1_hold.png")
-zombie_hold_img = pygame.transform.scale(zombie_hold_img, (ENEMY_SIZE, ENEMY_SIZE))
-zombie_stand_img = safe_load_image("assets/zoimbie1_stand.png")
-zombie_stand_img = pygame.transform.scale(zombie_stand_img, (ENEMY_SIZE, ENEMY_SIZE))
-
-pistol_sound = safe_load_sound("assets/pistol-shot.mp3")
-pistol_reloading = safe_load_sound("assets/gun-reload.mp3")
-background_zombie = safe_load_sound("assets/zombie.mp3")
-game_over_sound = safe_load_sound("assets/game-over.mp3")
-game_win_sound = safe_load_sound("assets/you-win-sequence.mp3")
-
-# volumes
-try:
-    pistol_sound.set_volume(0.1)
-    pistol_reloading.set_volume(0.5)
-    background_zombie.set_volume(0.08)
-    game_over_sound.set_volume(0.7)
-    game_win_sound.set_volume(0.7)
-except Exception:
-    pass
+def image_specs(width, height):
+    """nome -> (arquivo, tamanho final, alpha) das imagens do jogo para uma resolução."""
+    return {
+        "heart": ("assets/heartDisplayFull.png", (32, 32), True),
+        "background": ("assets/background.png", (width, height), False),
+        "player": ("assets/soldier1_gun.png", (PLAYER_SIZE, PLAYER_SIZE), True),
+        "player_reload": ("assets/soldier1_reload.png", (PLAYER_SIZE, PLAYER_SIZE), True),
+        "box": ("assets/tile_129.png", (BOX_SIZE, BOX_SIZE), True),
+        "zombie_hold": ("assets/zoimbie1_hold.png", (ENEMY_SIZE, ENEMY_SIZE), True),
+        "zombie_stand": ("assets/zoimbie1_stand.png", (ENEMY_SIZE, ENEMY_SIZE), True),
+    }
+
+IMAGE_SPECS = image_specs(WIDTH, HEIGHT)
+# pacote pré-escalado para esta resolução (gerado com --build-assets); se não
+# existir ou estiver desatualizado, cai no carregamento normal dos PNGs
+asset_pack = assetpack.open_pack(asset_path(assetpack.pack_name(WIDTH, HEIGHT)), IMAGE_SPECS)
+
+SOUND_SPECS = {
+    "pistol": ("assets/pistol-shot.mp3", 0.1),
+    "reload": ("assets/gun-reload.mp3", 0.5),
+    "ambience": ("assets/zombie.mp3", 0.08),
+    "game_over": ("assets/game-over.mp3", 0.7),
+    "game_win": ("assets/you-win-sequence.mp3", 0.7),
+    "hurt": ("assets/hurt.mp3", 0.5),
+}
+
+# categoria, vozes simultâneas, intervalo mínimo entre disparos (ms)
+SOUND_VOICES = {
+    "pistol": ("weapon", 3, 60),
+    "reload": ("weapon", 1, 500),
+    "ambience": ("ambience", 1, 0),
+    "game_over": ("stingers", 1, 1000),
+    "game_win": ("stingers", 1, 1000),
+    "hurt": ("hurt", 1, 150),
+}
+
+# decode em segundo plano: tudo começa como placeholder (magenta / mudo) e é
+# trocado pelo asset real em apply_asset() conforme chega
+assets = AssetManager(asset_pack)
+
+heart_img = assets.image("heart", *IMAGE_SPECS["heart"])
+background = assets.image("background", *IMAGE_SPECS["background"])
+renderer = DirtyRenderer(screen, background, DIRTY_RENDERING, DIRTY_FULL_THRESHOLD)
+
+player_img = assets.image("player", *IMAGE_SPECS["player"])
+player_reload_img = assets.image("player_reload", *IMAGE_SPECS["player_reload"])
+box_img = assets.image("box", *IMAGE_SPECS["box"])
+zombie_hold_img = assets.image("zombie_hold", *IMAGE_SPECS["zombie_hold"])
+zombie_stand_img = assets.image("zombie_stand", *IMAGE_SPECS["zombie_stand"])
+
+# rotações pré-calculadas dos sprites (lazy: só gera os ângulos usados)
+rotations = {
+    "player": RotationCache(player_img, ROTATION_STEPS, ROTATION_LAZY),
+    "player_reload": RotationCache(player_reload_img, ROTATION_STEPS, ROTATION_LAZY),
+    "zombie_hold": RotationCache(zombie_hold_img, ROTATION_STEPS, ROTATION_LAZY),
+    "zombie_stand": RotationCache(zombie_stand_img, ROTATION_STEPS, ROTATION_LAZY),
+}
+
+# bala: surface pronta em vez de um draw.rect por bala
+bullet_img = pygame.Surface((BULLET_SIZE, BULLET_SIZE))
+bullet_img.fill(YELLOW)
+
+# sprites do frame, enviados num único blits() por camada
+sprites = SpriteBatch(3)
+
+# canais reservados por categoria, limite de vozes e intervalo mínimo por som
+audio_manager = audio.AudioManager()
+pistol_sound = audio_manager.register("pistol", *SOUND_VOICES["pistol"])
+pistol_reloading = audio_manager.register("reload", *SOUND_VOICES["reload"])
+background_zombie = audio_manager.register("ambience", *SOUND_VOICES["ambience"])
+game_over_sound = audio_manager.register("game_over", *SOUND_VOICES["game_over"])
+game_win_sound = audio_manager.register("game_win", *SOUND_VOICES["game_win"])
+hurt_sound = audio_manager.register("hurt", *SOUND_VOICES["hurt"])
+for name, spec in SOUND_SPECS.items():
+    assets.sound(name, *spec)
+
+# textos do HUD renderizados só quando mudam
+text_cache = TextCache(64)
+hud = Hud(WIDTH, font, heart_img, text_cache)
 
 # ---------------------------
 # Estado do jogo
 # ---------------------------
-player_size = PLAYER_SIZE
-player_speed = PLAYER_SPEED
-
-enemy_size = ENEMY_SIZE
-enemy_speed = ENEMY_SPEED_INIT
+# toda a simulação vive no Game; aqui fica só o que é de tela e som
+game = Game(WIDTH, HEIGHT)
+drawn_layout = None
 
-bullet_size = BULLET_SIZE
-bullet_speed = BULLET_SPEED
+# input ao vivo (teclado/mouse) e, com --record, o gravador do replay
+keyboard = KeyboardInput()
+recorder = None
 
-enemies = []
-bullets = []
-obstacles = []
+# placar local: grava em background; a tela de fim de partida só lê scores.top.
+# Aberto só enquanto run/run_pipelined rodam (importar main não abre o disco)
+scores = None
 
-kill_count = 0
-wave = 1
-enemies_to_spawn = ENEMIES_TO_SPAWN_INIT
-game_win = False
-game_over = False
+profiler = Profiler(PROFILER_HISTORY)
+game.profiler = profiler
 
 played_game_win = False
 played_game_over = False
 
-zombie_switch_time = 3000
-last_zombie_switch = pygame.time.get_ticks()
-zombie_current_img = zombie_hold_img
-
-shots_fired = 0
-reloading = False
-reload_start = 0
-reload_sound_played = False
-
-# tocar ambiência (se disponível)
-try:
-    background_zombie.play(-1)
-except Exception:
-    pass
+def apply_asset(name, asset):
+    """Troca o placeholder pelo asset real (chamado por assets.poll())."""
+    global heart_img, background, player_img, player_reload_img, box_img
+    global zombie_hold_img, zombie_stand_img, drawn_layout
+    if name == "heart":
+        heart_img = hud.heart_img = asset
+        hud.key = None
+    elif name == "background":
+        background = asset
+        drawn_layout = None
+    elif name == "box":
+        box_img = asset
+        drawn_layout = None
+    elif name in rotations:
+        rotations[name] = RotationCache(asset, ROTATION_STEPS, ROTATION_LAZY)
+        if name == "player":
+            player_img = asset
+        elif name == "player_reload":
+            player_reload_img = asset
+        elif name == "zombie_hold":
+            zombie_hold_img = asset
+        else:
+            zombie_stand_img = asset
+    elif name in SOUND_SPECS:
+        audio_manager.set_sound(name, asset)
+        if name == "ambience":
+            # tocar ambiência assim que chegar
+            background_zombie.play(-1)
+
+assets.on_ready(apply_asset)
 
 # ---------------------------
-# Funções utilitárias do jogo
+# Eventos / Loop principal (separado por funções)
 # ---------------------------
-def spawn_obstacles(num=OBSTACLES_COUNT):
-    obstacles.clear()
-    for _ in range(num):
-        attempts = 0
-        while True:
-            attempts += 1
-            if attempts > 200:
-                break
-            x = random.randint(0, WIDTH - BOX_SIZE)
-            y = random.randint(0, HEIGHT - BOX_SIZE)
-            new_box = pygame.Rect(x, y, BOX_SIZE, BOX_SIZE)
-            player_rect = pygame.Rect(WIDTH // 2, HEIGHT // 2, PLAYER_SIZE, PLAYER_SIZE)
-            if not new_box.colliderect(player_rect) and not any(new_box.colliderect(o) for o in obstacles):
-                obstacles.append(new_box)
-                break
-
-def init_enemies():
-    enemies.clear()
-    attempts = 0
-    spawned = 0
-    while spawned < enemies_to_spawn and attempts < enemies_to_spawn * 10:
-        e = Enemy.spawn(enemy_size, enemy_speed, WIDTH, HEIGHT, enemies)
-        attempts += 1
-        if e:
-            enemies.append(e)
-            spawned += 1
-
-def reset_game():
-    global game_over, game_win, player, bullets, enemies, kill_count
-    global shots_fired, reloading, reload_sound_played
-    global last_zombie_switch, zombie_current_img
-    global wave, enemy_speed, enemies_to_spawn
+def clear_stingers():
     global played_game_over, played_game_win
-
-    game_over = False
-    game_win = False
-
-    # recriar player
-    player = Player(WIDTH // 2, HEIGHT // 2, PLAYER_SIZE, PLAYER_SPEED)
-
-    bullets.clear()
-    enemies.clear()
-    kill_count = 0
-    shots_fired = 0
-    reloading = False
-    reload_sound_played = False
-
-    last_zombie_switch = pygame.time.get_ticks()
-    zombie_current_img = zombie_hold_img
-
-    # reset das waves
-    wave = 1
-    enemy_speed = ENEMY_SPEED_INIT
-    enemies_to_spawn = ENEMIES_TO_SPAWN_INIT
-
     played_game_over = False
     played_game_win = False
 
-    spawn_obstacles(OBSTACLES_COUNT)
-    init_enemies()
+def restart():
+    game.reset()
+    clear_stingers()
 
-
-# cria o player e o mapa inicial
-player = Player(WIDTH // 2, HEIGHT // 2, PLAYER_SIZE, PLAYER_SPEED)
-spawn_obstacles(OBSTACLES_COUNT)
-init_enemies()
-
-# ---------------------------
-# Eventos / Loop principal (separado por funções)
-# ---------------------------
 def handle_events():
-    global running, shots_fired, reloading, reload_start, reload_sound_played, game_over, game_win
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             return False
-
-        if event.type == pygame.MOUSEBUTTONDOWN and not game_over and not game_win:
-            if not reloading:
-                if shots_fired < MAX_SHOTS:
-                    try:
-                        pistol_sound.play()
-                    except Exception:
-                        pass
-                    mx, my = pygame.mouse.get_pos()
-                    bullets.append(Bullet(player.centerx, player.centery, mx, my, bullet_size, bullet_speed))
-                    shots_fired += 1
-                if shots_fired >= MAX_SHOTS:
-                    reloading = True
-                    reload_start = pygame.time.get_ticks()
-                    reload_sound_played = False
-
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r and (game_over or game_win):
-                reset_game()
-
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle_overlay()
+        keyboard.on_event(event, game.finished)
     return True
 
-def update(dt):
-    global reloading, shots_fired, reload_sound_played, last_zombie_switch, zombie_current_img
-    global game_over, kill_count, wave, enemies_to_spawn, enemy_speed, game_win, played_game_over, played_game_win
-
-    if reloading:
-        if not reload_sound_played:
-            try:
-                pistol_reloading.play()
-            except Exception:
-                pass
-            reload_sound_played = True
-        if pygame.time.get_ticks() - reload_start >= RELOAD_TIME_MS:
-            shots_fired = 0
-            reloading = False
-            reload_sound_played = False
-
-    current_time = pygame.time.get_ticks()
-    if current_time - last_zombie_switch >= zombie_switch_time:
-        zombie_current_img = zombie_stand_img if zombie_current_img == zombie_hold_img else zombie_hold_img
-        last_zombie_switch = current_time
-
-    if not game_over and not game_win:
-        player.handle_input(WIDTH, HEIGHT)
-        player.move_and_collide(obstacles, WIDTH, HEIGHT)
-        player.update_invincible()
-
-        # inimigos se movendo
-        for enemy in enemies[:]:
-            enemy.move_towards_player(player, enemies, obstacles)
-            if player.colliderect(enemy):
-                player.take_damage()
-                if getattr(player, "life", None) is not None:
-                    if player.life <= 0:
-                        game_over = True
-                else:
-                    game_over = True
-                # remove o inimigo que bateu no player
-                if enemy in enemies:
-                    enemies.remove(enemy)
-
-        # balas
-        for bullet in bullets[:]:
-            bullet.move()
-            if bullet.offscreen(WIDTH, HEIGHT):
-                if bullet in bullets: bullets.remove(bullet)
-                continue
-
-            for enemy in enemies[:]:
-                if bullet.rect.colliderect(enemy):
-                    if bullet in bullets: bullets.remove(bullet)
-                    died = False
-                    if hasattr(enemy, "hit_react"):
-                        try:
-                            died = enemy.hit_react(bullet.rect.x, bullet.rect.y)
-                        except Exception:
-                            died = True
-                    else:
-                        died = True
-
-                    if died and enemy in enemies:
-                        enemies.remove(enemy)
-                        kill_count += 1
-                    break
-
-        # waves
-        if len(enemies) == 0:
-            wave += 1
-            if wave > MAX_WAVES:
-                game_win = True
-            else:
-                enemies_to_spawn = int(5 + (wave * 7))
-                enemy_speed += 0.20
-                init_enemies()
-
-def draw():
-    global played_game_win, played_game_over
-    screen.blit(background, (0, 0))
-
-    for box in obstacles:
-        screen.blit(box_img, (box.x, box.y))
+def play_events(events):
+    # sons pedidos pela simulação
+    for name in events:
+        if name == "pistol":
+            pistol_sound.play()
+        elif name == "reload":
+            pistol_reloading.play()
+        elif name == "hurt":
+            hurt_sound.play()
 
+def update(dt):
+    inp = keyboard.next()
+    if inp.restart:
+        clear_stingers()
+    game.apply(inp, dt)
+    after_tick(inp, game)
+    play_events(game.events)
+    game.events.clear()
+
+def after_tick(inp, sim):
+    # depois de cada tick (na thread da simulação no modo em pipeline)
+    if recorder is not None:
+        recorder.record(inp, sim)
+    if scores is not None and "run_end" in sim.events:
+        scores.submit(Run.from_game(sim))
+
+def debug_allocations():
+    """Alocações do último tick: objetos criados/reusados pelos pools,
+    blocos de memória líquidos e coletas do GC. A primeira chamada liga a
+    contagem (desligada por padrão), então só vale a partir do tick seguinte."""
+    game.alloc_stats.enabled = True
+    return game.alloc_stats.last
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+def draw_background(snap):
+    global drawn_layout
+    # layout novo de obstáculos (ou fundo/caixa que acabou de carregar): as
+    # caixas são desenhadas uma vez numa cópia do fundo e a tela é redesenhada
+    if drawn_layout != snap.layout_version:
+        drawn_layout = snap.layout_version
+        renderer.bake(background, box_img, snap.obstacles)
+    renderer.begin()
+
+def draw_sprites(snap, alpha):
+    prev_x, prev_y, x, y, w, h = snap.player
+    pcx = lerp(prev_x, x, alpha) + w / 2
+    pcy = lerp(prev_y, y, alpha) + h / 2
     mx, my = pygame.mouse.get_pos()
-    dx = mx - player.centerx
-    dy = my - player.centery
+    dx = mx - pcx
+    dy = my - pcy
     angle = math.degrees(math.atan2(-dy, dx))
-    current_player_img = player_reload_img if reloading else player_img
-    rotated_img = pygame.transform.rotate(current_player_img, angle)
-    rotated_rect = rotated_img.get_rect(center=(player.centerx, player.centery))
-    screen.blit(rotated_img, rotated_rect)
-
-    for enemy in enemies[:]:
-        dx = player.centerx - enemy.centerx
-        dy = player.centery - enemy.centery
+    player_rot = rotations["player_reload" if snap.reloading else "player"]
+    sprites.add(LAYER_PLAYER, *player_rot.place(angle, int(pcx), int(pcy)))
+
+    zombie_stand = int(snap.sim_time // ZOMBIE_SWITCH_MS) % 2 == 1
+    zombie_rot = rotations["zombie_stand" if zombie_stand else "zombie_hold"]
+    half = ENEMY_SIZE / 2
+    it = iter(snap.enemies)
+    for prev_x, prev_y, x, y in zip(it, it, it, it):
+        ecx = lerp(prev_x, x, alpha) + half
+        ecy = lerp(prev_y, y, alpha) + half
+        dx = pcx - ecx
+        dy = pcy - ecy
         angle = math.degrees(math.atan2(-dy, dx))
-        rotated_zombie = pygame.transform.rotate(zombie_current_img, angle)
-        rotated_rect = rotated_zombie.get_rect(center=(enemy.centerx, enemy.centery))
-        screen.blit(rotated_zombie, rotated_rect)
-
-    for bullet in bullets:
-        try:
-            pygame.draw.rect(screen, YELLOW, bullet.rect)
-        except Exception:
-            pass
-
-    if reloading:
-        reload_text = font.render("Recarregando...", True, RED)
-        screen.blit(reload_text, (WIDTH // 2 - reload_text.get_width() // 2, 10))
-
-    life_count = getattr(player, "life", PLAYER_START_LIFE)
-    for i in range(life_count):
-        screen.blit(heart_img, (10 + i * 35, 10))
-
-    wave_text = font.render(f"Wave: {wave}", True, BLACK)
-    screen.blit(wave_text, (10, 90))
-    kills_text = font.render(f"Inimigos mortos: {kill_count}", True, BLACK)
-    screen.blit(kills_text, (10, 50))
-
-    if len(enemies) == 0 and not (game_win or game_over):
-        next_wave_text = font.render("Next Wave!", True, RED)
-        screen.blit(next_wave_text, (WIDTH // 2 - next_wave_text.get_width() // 2, HEIGHT // 2 - 150))
-
-    if game_win:
+        sprites.add(LAYER_ZOMBIES, *zombie_rot.place(angle, int(ecx), int(ecy)))
+
+    it = iter(snap.bullets)
+    for prev_x, prev_y, x, y in zip(it, it, it, it):
+        sprites.add(LAYER_BULLETS, bullet_img, (int(lerp(prev_x, x, alpha)), int(lerp(prev_y, y, alpha))))
+
+    sprites.flush(renderer)
+
+def draw_hud(snap):
+    global played_game_win, played_game_over
+    kill_count = snap.kills
+    life = snap.life
+    renderer.blit(*hud.overlay(life, kill_count, snap.wave, snap.reloading))
+
+    # os stingers seguem o snapshot desenhado, não a tecla R: no modo em
+    # pipeline o snapshot do fim ainda é desenhado depois do restart
+    if not snap.finished:
+        played_game_win = False
+        played_game_over = False
+
+    if snap.enemy_count == 0 and not snap.finished:
+        next_wave_text = text_cache.render(font, "Next Wave!", RED)
+        renderer.blit(next_wave_text, (WIDTH // 2 - next_wave_text.get_width() // 2, HEIGHT // 2 - 150))
+
+    if snap.game_win:
         if not played_game_win:
-            try:
-                game_win_sound.play()
-            except Exception:
-                pass
+            game_win_sound.play()
             played_game_win = True
-        win_text = game_over_font.render("VOCÊ VENCEU!", True, BLUE)
-        info_text = font.render(f"Inimigos mortos: {kill_count} - Vidas perdidas: {PLAYER_START_LIFE - getattr(player, 'life', 0)}", True, BLACK)
-        restart_text = font.render("Pressione R para reiniciar", True, BLACK)
-        screen.blit(win_text, (WIDTH // 2 - win_text.get_width() // 2, HEIGHT // 2 - 60))
-        screen.blit(info_text, (WIDTH // 2 - info_text.get_width() // 2, HEIGHT // 2))
-        screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 50))
-
-    if game_over:
+        win_text = text_cache.render(game_over_font, "VOCÊ VENCEU!", BLUE)
+        info_text = text_cache.render(font, f"Inimigos mortos: {kill_count} - Vidas perdidas: {PLAYER_START_LIFE - life}", BLACK)
+        restart_text = text_cache.render(font, "Pressione R para reiniciar", BLACK)
+        renderer.blit(win_text, (WIDTH // 2 - win_text.get_width() // 2, HEIGHT // 2 - 60))
+        renderer.blit(info_text, (WIDTH // 2 - info_text.get_width() // 2, HEIGHT // 2))
+        renderer.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2 + 50))
+        draw_scores(HEIGHT // 2 + 110)
+
+    if snap.game_over:
         if not played_game_over:
-            try:
-                game_over_sound.play()
-            except Exception:
-                pass
+            game_over_sound.play()
         played_game_over = True
-        go_text = game_over_font.render("GAME OVER", True, RED)
-        info_text = font.render(f"Inimigos mortos: {kill_count} - Pressione R para reiniciar", True, BLACK)
-        screen.blit(go_text, (WIDTH // 2 - go_text.get_width() // 2, HEIGHT // 2 - 50))
-        screen.blit(info_text, (WIDTH // 2 - info_text.get_width() // 2, HEIGHT // 2 + 20))
+        go_text = text_cache.render(game_over_font, "GAME OVER", RED)
+        info_text = text_cache.render(font, f"Inimigos mortos: {kill_count} - Pressione R para reiniciar", BLACK)
+        renderer.blit(go_text, (WIDTH // 2 - go_text.get_width() // 2, HEIGHT // 2 - 50))
+        renderer.blit(info_text, (WIDTH // 2 - info_text.get_width() // 2, HEIGHT // 2 + 20))
+        draw_scores(HEIGHT // 2 + 80)
+
+def draw_scores(y):
+    # ranking já em memória (scores.top); a partida que acabou aparece em vermelho
+    if scores is None:
+        return
+    last = scores.last
+    lines = [("Melhores pontuações", BLUE)]
+    for pos, run in enumerate(scores.top[:SCORES_SHOWN], 1):
+        lines.append((format_run(pos, run), RED if last is not None and run is last[0] else BLACK))
+    if last is not None and (last[1] is None or last[1] > SCORES_SHOWN):
+        place = f"{last[1]}º" if last[1] is not None else f"fora do top {TOP_N}"
+        lines.append((f"Sua partida: {last[0].score} pts ({place})", RED))
+    for text, color in lines:
+        surf = text_cache.render(font, text, color)
+        renderer.blit(surf, (WIDTH // 2 - surf.get_width() // 2, y))
+        y += surf.get_height() + 4
+
+def draw_profiler():
+    if profiler.show_overlay:
+        panel = profiler.overlay(profiler_font)
+        renderer.blit(panel, (WIDTH - panel.get_width() - 10, 10))
+
+def draw(snap, alpha=1.0):
+    """snap: pipeline.Snapshot a desenhar; alpha: fração do passo atual já
+    decorrida, para interpolar posições."""
+    section = profiler.section
+    with section("draw.background"):
+        draw_background(snap)
+    with section("draw.sprites"):
+        draw_sprites(snap, alpha)
+    with section("draw.hud"):
+        draw_hud(snap)
+    draw_profiler()
 
 # ---------------------------
 # Main loop
 # ---------------------------
-running = True
-while running:
-    dt = clock.tick(FPS)
-    running = handle_events()
-    update(dt)
-    draw()
-    pygame.display.flip()
-
-pygame.quit()
+def draw_loading(done, total):
+    screen.fill(BLACK)
+    text = text_cache.render(font, f"Carregando... {done}/{total}", WHITE)
+    screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 40))
+    bar = pygame.Rect(0, 0, WIDTH // 3, 20)
+    bar.center = (WIDTH // 2, HEIGHT // 2 + 10)
+    pygame.draw.rect(screen, WHITE, bar, 2)
+    fill = bar.inflate(-6, -6)
+    fill.width = fill.width * done // max(total, 1)
+    pygame.draw.rect(screen, WHITE, fill)
+
+def loading_screen():
+    """Mostra o progresso até todos os assets chegarem. Retorna False se fechou a janela."""
+    while not assets.done:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+        assets.poll()
+        draw_loading(*assets.progress())
+        pygame.display.flip()
+        clock.tick(FPS)
+    renderer.invalidate()
+    return True
+
+def open_scores():
+    global scores
+    scores = ScoreStore()
+
+def close_scores():
+    """Grava o que ficou na fila do placar e encerra a thread dele."""
+    global scores
+    if scores is not None:
+        scores.close()
+        scores = None
+
+def run():
+    if not loading_screen():
+        return
+    open_scores()
+    # passo fixo com acumulador; o draw interpola entre os dois últimos passos
+    accumulator = 0.0
+    running = True
+    section = profiler.section
+    snap = None
+    try:
+        while running:
+            accumulator += min(clock.tick(FPS), MAX_FRAME_MS)
+            profiler.begin_frame()
+            with section("events"):
+                running = handle_events()
+                assets.poll()
+            while accumulator >= TICK_MS:
+                with section("update"):
+                    update(TICK_MS)
+                accumulator -= TICK_MS
+            with section("snapshot"):
+                snap = capture(game, snap)
+            draw(snap, accumulator / TICK_MS)
+            with section("present"):
+                renderer.present()
+            profiler.end_frame(enemies=snap.enemy_count, bullets=len(game.bullets),
+                               blits=len(renderer.prev))
+    finally:
+        close_scores()
+
+def run_pipelined():
+    """Simulação na SimThread; aqui só eventos, input, desenho e present.
+    Retorna as métricas do pipeline."""
+    if not loading_screen():
+        return None
+    open_scores()
+    sim = SimThread(game, TICK_MS, after_tick)
+    # o profiler é do render; a simulação fica com um próprio, desligado
+    game.profiler = Profiler()
+    sim.start()
+    running = True
+    section = profiler.section
+    try:
+        while running:
+            clock.tick(FPS)
+            snap, alpha = sim.acquire()
+            profiler.begin_frame()
+            with section("events"):
+                running = handle_events()
+                assets.poll()
+                sim.submit(keyboard.next())
+                play_events(sim.drain_events())
+            draw(snap, alpha)
+            with section("present"):
+                renderer.present()
+            sim.frame_done()
+            profiler.end_frame(enemies=snap.enemy_count, bullets=len(snap.bullets) // 4,
+                               blits=len(renderer.prev))
+    finally:
+        # a SimThread para antes: o after_tick dela é quem submete ao placar
+        sim.stop()
+        game.profiler = profiler
+        close_scores()
+    return sim.metrics()
+
+def run_headless(max_ticks):
+    # sem draw e sem esperar o relógio: roda até o fim da partida ou max_ticks
+    ticks = 0
+    start = time.perf_counter()
+    while ticks < max_ticks and not game.finished:
+        pygame.event.pump()
+        game.step()
+        ticks += 1
+    wall = time.perf_counter() - start
+    sim_s = ticks * TICK_MS / 1000.0
+    print(f"ticks={ticks} sim={sim_s:.1f}s real={wall:.2f}s "
+          f"({sim_s / max(wall, 1e-9):.0f}x) wave={game.wave} kills={game.kill_count} "
+          f"vida={game.player.life} {'venceu' if game.game_win else 'perdeu' if game.game_over else 'parou'}")
+
+def build_assets(width, height):
+    """Gera o pacote de assets pré-escalados para a resolução width x height."""
+    out = assetpack.build(asset_path(assetpack.pack_name(width, height)),
+                          image_specs(width, height),
+                          lambda path: pygame.image.load(asset_path(path)))
+    print(f"Pacote de assets gerado: {out}")
+
+if __name__ == "__main__":
+    if "--build-assets" in sys.argv:
+        # ex.: python main.py --build-assets --size 1920x1080 (resolução da máquina alvo)
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--build-assets", action="store_true")
+        parser.add_argument("--size", default=f"{WIDTH}x{HEIGHT}")
+        args = parser.parse_args()
+        w, h = (int(v) for v in args.size.lower().split("x"))
+        build_assets(w, h)
+    elif "--headless" in sys.argv:
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--headless", action="store_true")
+        parser.add_argument("--ticks", type=int, default=TICK_RATE * 60 * 10)
+        args = parser.parse_args()
+        run_headless(args.ticks)
+    else:
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--record", metavar="ARQUIVO", help="grava a sessão num replay (.bzrp)")
+        parser.add_argument("--profile", action="store_true", help="liga o profiler com o overlay")
+        parser.add_argument("--trace", metavar="ARQUIVO", help="grava trace JSON do Chrome ao sair")
+        parser.add_argument("--profile-csv", metavar="ARQUIVO", help="grava CSV por frame ao sair")
+        parser.add_argument("--pipelined", action="store_true", default=PIPELINED,
+                            help="simulação numa thread separada do render")
+        args = parser.parse_args()
+        if args.record:
+            recorder = Recorder(game)
+        if args.profile and not profiler.show_overlay:
+            profiler.toggle_overlay()
+        if args.trace or args.profile_csv:
+            profiler.enabled = profiler.record = True
+        if args.pipelined:
+            metrics = run_pipelined()
+            if metrics is not None:
+                print(json.dumps({"pipeline": metrics}, indent=2))
+        else:
+            run()
+        if recorder is not None:
+            recorder.save(args.record)
+            print(f"Replay gravado: {args.record} ({recorder.tick} ticks, seed {game.seed})")
+        if args.trace:
+            profiler.write_trace(args.trace)
+        if args.profile_csv:
+            profiler.write_csv(args.profile_csv)
+        if profiler.enabled:
+            print(json.dumps(profiler.summary(), indent=2))
+    assets.shutdown()
+    pygame.quit()
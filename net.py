@@ -0,0 +1,794 @@
+# net.py
+# Co-op em rede: servidor autoritativo sem tela, que roda o Game com vários
+# players, e cliente que manda comandos e prevê o próprio movimento.
+#
+# UDP, uma mensagem por datagrama (little-endian):
+#   cliente -> servidor
+#     HELLO    tipo u8 | versão u16
+#     INPUT    tipo u8 | último snapshot recebido u32 | n u8 | n comandos
+#              (seq u32 | movimento u8, bit 7 = tiro | mira i16 i16 se tiro),
+#              do mais antigo ao mais novo; o cliente repete os comandos
+#              ainda não confirmados, então perder um pacote não perde input
+#     BYE      tipo u8
+#   servidor -> cliente
+#     WELCOME  tipo u8 | slot u8 | tick rate u16 | largura u16 | altura u16
+#     FULL     tipo u8 (sem vaga)
+#     SNAPSHOT tipo u8 | tick u32 | baseline u32 (0 = completo) | último comando
+#              aplicado u32 | wave u8 | kills u16 | tiros u8 | flags u8
+#              | obstáculos se FLAG_LAYOUT: n u16 + (x i16, y i16) * n
+#              | removidos | adicionados | alterados (ids em ordem, varint da diferença)
+#
+# Entidades: id = uid << 2 | tipo (player, zumbi, bala), posição em quartos de
+# pixel e hp. Cada snapshot é um delta contra o último snapshot que o cliente
+# confirmou: quem sumiu, quem apareceu (estado inteiro) e quem mudou (só os
+# campos que mudaram, em varint zigzag); quem ficou parado não vai. Interesse:
+# cada cliente recebe todos os players e, dentro de NET_INTEREST_RADIUS do seu
+# player, as NET_VIEW_LIMIT entidades mais perto.
+#
+# Uso:
+#   python net.py --serve --players 2 --port 7777
+#   python net.py --connect 127.0.0.1:7777          # cliente bot, sem tela
+#   python net.py --loopback --players 4 --zombies 500 --loss 0.05
+import argparse
+import heapq
+import json
+import os
+import random
+import socket
+import struct
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from game import Game, TICK_RATE, TICK_MS, PLAYER_SIZE, PLAYER_SPEED, ENEMY_SIZE, BOX_SIZE
+from inputs import TickInput
+from player import Player
+from bot import Bot
+
+# ---------------------------
+# Constantes / Configurações
+# ---------------------------
+NET_PORT = 7777
+NET_VERSION = 1
+# entidades fora desse raio do player não são enviadas ao cliente dele
+NET_INTEREST_RADIUS = 1100
+# teto de entidades (além dos players) por cliente; as mais perto ficam
+NET_VIEW_LIMIT = 160
+# snapshots enviados guardados por cliente (baselines possíveis para o delta)
+NET_HISTORY = 64
+# comandos repetidos em cada INPUT (cobre perda de pacote)
+NET_REDUNDANCY = 4
+# comandos na fila de um cliente; se ele manda mais rápido que o tick, os
+# mais velhos são descartados (não acumula latência nem memória)
+NET_MAX_QUEUED = 8
+# cliente calado por mais que isso perde a vaga
+NET_TIMEOUT_S = 5.0
+# posições vão em 1/NET_QUANT px
+NET_QUANT = 4
+MAX_DATAGRAM = 65507
+
+HELLO = 1
+INPUT = 2
+BYE = 3
+WELCOME = 10
+FULL = 11
+SNAPSHOT = 12
+
+KIND_PLAYER = 0
+KIND_ZOMBIE = 1
+KIND_BULLET = 2
+
+FLAG_GAME_OVER = 1
+FLAG_GAME_WIN = 2
+FLAG_LAYOUT = 4
+FLAG_RELOADING = 8
+
+FIRE_BIT = 0x80
+
+# o que um datagrama malformado pode levantar ao ser lido; o pacote é descartado
+MALFORMED = (struct.error, IndexError, KeyError, ValueError)
+
+_HELLO = struct.Struct("<BH")
+_INPUT = struct.Struct("<BIB")
+_CMD = struct.Struct("<IB")
+_AIM = struct.Struct("<hh")
+_WELCOME = struct.Struct("<BBHHH")
+_SNAP = struct.Struct("<BIIIBHBB")
+_COUNT = struct.Struct("<H")
+_POINT = struct.Struct("<hh")
+_ADDED = struct.Struct("<hhB")
+
+
+def _write_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _zigzag(n):
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def _unzigzag(n):
+    return n // 2 if n % 2 == 0 else -(n + 1) // 2
+
+
+def quantize(v):
+    return int(round(v * NET_QUANT))
+
+
+# ---------------------------
+# Snapshots
+# ---------------------------
+def world_state(game):
+    """Entidades do tick: (id, x, y, estado) com estado = (qx, qy, hp) quantizado."""
+    items = []
+    for slot, p in enumerate(game.players):
+        items.append((slot << 2 | KIND_PLAYER, p.centerx, p.centery,
+                      (quantize(p.x), quantize(p.y), max(p.life, 0))))
+    half = ENEMY_SIZE / 2
+    for e in game.enemies:
+        items.append((e.uid << 2 | KIND_ZOMBIE, e.x + half, e.y + half,
+                      (quantize(e.x), quantize(e.y), max(e.hp, 0))))
+    for b in game.bullets:
+        items.append((b.uid << 2 | KIND_BULLET, b.x, b.y, (quantize(b.x), quantize(b.y), 0)))
+    return items
+
+
+def interest(items, px, py, radius=NET_INTEREST_RADIUS, limit=NET_VIEW_LIMIT):
+    """Visão de um cliente: dict id -> estado com todos os players e as
+    `limit` entidades mais perto de (px, py) dentro de `radius`."""
+    view = {}
+    r2 = radius * radius
+    near = []
+    for item in items:
+        key = item[0]
+        if key & 3 == KIND_PLAYER:
+            view[key] = item[3]
+            continue
+        dx = item[1] - px
+        dy = item[2] - py
+        d2 = dx * dx + dy * dy
+        if d2 <= r2:
+            near.append((d2, key, item[3]))
+    if len(near) > limit:
+        near = heapq.nsmallest(limit, near)
+    for _, key, state in near:
+        view[key] = state
+    return view
+
+
+def encode_snapshot(tick, baseline_tick, baseline, view, last_seq, game, slot, obstacles=None):
+    """Datagrama SNAPSHOT de `view` como delta contra `baseline` (dict; vazio = completo)."""
+    player = game.players[slot]
+    flags = 0
+    if game.game_over:
+        flags |= FLAG_GAME_OVER
+    if game.game_win:
+        flags |= FLAG_GAME_WIN
+    if player.reloading:
+        flags |= FLAG_RELOADING
+    if obstacles is not None:
+        flags |= FLAG_LAYOUT
+    buf = bytearray(_SNAP.pack(SNAPSHOT, tick, baseline_tick, last_seq, min(game.wave, 255),
+                               min(game.kill_count, 0xFFFF), player.shots_fired, flags))
+    if obstacles is not None:
+        buf += _COUNT.pack(len(obstacles))
+        for x, y in obstacles:
+            buf += _POINT.pack(x, y)
+
+    removed = sorted(k for k in baseline if k not in view)
+    added = []
+    changed = []
+    for k in sorted(view):
+        old = baseline.get(k)
+        if old is None:
+            added.append(k)
+        elif old != view[k]:
+            changed.append(k)
+
+    _write_varint(buf, len(removed))
+    prev = 0
+    for k in removed:
+        _write_varint(buf, k - prev)
+        prev = k
+    _write_varint(buf, len(added))
+    prev = 0
+    for k in added:
+        _write_varint(buf, k - prev)
+        prev = k
+        qx, qy, hp = view[k]
+        buf += _ADDED.pack(qx, qy, hp)
+    _write_varint(buf, len(changed))
+    prev = 0
+    for k in changed:
+        _write_varint(buf, k - prev)
+        prev = k
+        qx, qy, hp = view[k]
+        ox, oy, ohp = baseline[k]
+        mask = (qx != ox) | (qy != oy) << 1 | (hp != ohp) << 2
+        buf.append(mask)
+        if mask & 1:
+            _write_varint(buf, _zigzag(qx - ox))
+        if mask & 2:
+            _write_varint(buf, _zigzag(qy - oy))
+        if mask & 4:
+            buf.append(hp)
+    return bytes(buf)
+
+
+def decode_snapshot(data, baselines):
+    """Reconstrói a visão de um SNAPSHOT. baselines: dict tick -> visão já
+    recebida. Retorna (header, visão) ou None se a baseline não está mais aqui."""
+    _, tick, baseline_tick, last_seq, wave, kills, shots, flags = _SNAP.unpack_from(data, 0)
+    pos = _SNAP.size
+    if baseline_tick:
+        base = baselines.get(baseline_tick)
+        if base is None:
+            return None
+    else:
+        base = {}
+    obstacles = None
+    if flags & FLAG_LAYOUT:
+        n, = _COUNT.unpack_from(data, pos)
+        pos += _COUNT.size
+        obstacles = [_POINT.unpack_from(data, pos + i * _POINT.size) for i in range(n)]
+        pos += n * _POINT.size
+
+    view = dict(base)
+    n, pos = _read_varint(data, pos)
+    k = 0
+    for _ in range(n):
+        d, pos = _read_varint(data, pos)
+        k += d
+        del view[k]
+    n, pos = _read_varint(data, pos)
+    k = 0
+    for _ in range(n):
+        d, pos = _read_varint(data, pos)
+        k += d
+        view[k] = _ADDED.unpack_from(data, pos)
+        pos += _ADDED.size
+    n, pos = _read_varint(data, pos)
+    k = 0
+    for _ in range(n):
+        d, pos = _read_varint(data, pos)
+        k += d
+        qx, qy, hp = view[k]
+        mask = data[pos]
+        pos += 1
+        if mask & 1:
+            d, pos = _read_varint(data, pos)
+            qx += _unzigzag(d)
+        if mask & 2:
+            d, pos = _read_varint(data, pos)
+            qy += _unzigzag(d)
+        if mask & 4:
+            hp = data[pos]
+            pos += 1
+        view[k] = (qx, qy, hp)
+
+    header = SimpleNamespace(tick=tick, baseline=baseline_tick, last_seq=last_seq, wave=wave,
+                             kills=kills, shots=shots, flags=flags, obstacles=obstacles)
+    return header, view
+
+
+def encode_command(buf, seq, inp):
+    code = (inp.dx + 1) * 3 + (inp.dy + 1)
+    if inp.fire:
+        buf += _CMD.pack(seq, code | FIRE_BIT)
+        buf += _AIM.pack(inp.aim_x, inp.aim_y)
+    else:
+        buf += _CMD.pack(seq, code)
+
+
+def decode_input(data):
+    """INPUT -> (ack, [(seq, TickInput), ...]). ValueError/struct.error se malformado."""
+    _, ack, n = _INPUT.unpack_from(data, 0)
+    pos = _INPUT.size
+    commands = []
+    for _ in range(n):
+        seq, code = _CMD.unpack_from(data, pos)
+        pos += _CMD.size
+        move = code & ~FIRE_BIT
+        if move > 8:
+            raise ValueError(f"movimento inválido: {move}")
+        inp = TickInput(move // 3 - 1, move % 3 - 1)
+        if code & FIRE_BIT:
+            inp.fire = True
+            inp.aim_x, inp.aim_y = _AIM.unpack_from(data, pos)
+            pos += _AIM.size
+        commands.append((seq, inp))
+    return ack, commands
+
+
+# ---------------------------
+# Servidor
+# ---------------------------
+class RemotePlayer:
+    """Estado do servidor para um cliente conectado."""
+
+    def __init__(self, addr, slot, now):
+        self.addr = addr
+        self.slot = slot
+        self.last_heard = now
+        self.commands = deque(maxlen=NET_MAX_QUEUED)
+        self.last_received = 0
+        self.last_applied = 0
+        self.move = (0, 0)
+        self.acked = 0
+        self.acked_layout = None
+        self.sent = {}
+        self.sent_layout = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def next_input(self):
+        """Um comando por tick, na ordem; sem comando novo repete o último movimento."""
+        if self.commands:
+            seq, inp = self.commands.popleft()
+            self.last_applied = seq
+            self.move = (inp.dx, inp.dy)
+            return inp
+        return TickInput(*self.move)
+
+
+class Server:
+    """
+    Servidor autoritativo: poll() lê os datagramas, tick() aplica um comando
+    de cada player, avança o Game e manda um snapshot para cada cliente.
+    """
+
+    def __init__(self, game, sock):
+        self.game = game
+        self.sock = sock
+        sock.setblocking(False)
+        self.slots = [None] * len(game.players)
+        self.by_addr = {}
+        self.tick_count = 0
+        self.layout_version = None
+        self.obstacles = ()
+        self.sim_times = []
+        self.net_times = []
+        self.max_datagram = 0
+        self.bad_packets = 0
+        # perda simulada de pacotes recebidos (loopback)
+        self.loss = 0.0
+        self.loss_rng = random.Random(0)
+
+    @property
+    def connected(self):
+        return sum(1 for c in self.slots if c is not None)
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        sock = self.sock
+        while True:
+            try:
+                data, addr = sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionResetError:
+                continue
+            if self.loss and self.loss_rng.random() < self.loss:
+                continue
+            try:
+                self._handle(data, addr, now)
+            except MALFORMED:
+                self.bad_packets += 1
+        for c in self.slots:
+            if c is not None and now - c.last_heard > NET_TIMEOUT_S:
+                self._drop(c)
+
+    def _handle(self, data, addr, now):
+        if not data:
+            raise ValueError("datagrama vazio")
+        kind = data[0]
+        client = self.by_addr.get(addr)
+        if kind == HELLO:
+            if client is None:
+                _, version = _HELLO.unpack_from(data, 0)
+                free = [i for i, c in enumerate(self.slots) if c is None]
+                if version != NET_VERSION or not free:
+                    self.sock.sendto(bytes((FULL,)), addr)
+                    return
+                client = RemotePlayer(addr, free[0], now)
+                self.slots[client.slot] = client
+                self.by_addr[addr] = client
+            self.sock.sendto(_WELCOME.pack(WELCOME, client.slot, TICK_RATE,
+                                           self.game.width, self.game.height), addr)
+        elif client is None:
+            return
+        elif kind == INPUT:
+            client.last_heard = now
+            client.bytes_received += len(data)
+            ack, commands = decode_input(data)
+            if ack > client.acked and ack in client.sent:
+                client.acked = ack
+                client.acked_layout = client.sent_layout[ack]
+            for seq, inp in commands:
+                if seq > client.last_received:
+                    client.commands.append((seq, inp))
+                    client.last_received = seq
+        elif kind == BYE:
+            self._drop(client)
+
+    def _drop(self, client):
+        self.slots[client.slot] = None
+        self.by_addr.pop(client.addr, None)
+
+    def tick(self):
+        game = self.game
+        t0 = time.perf_counter()
+        inputs = [c.next_input() if c is not None else TickInput() for c in self.slots]
+        game.apply_all(inputs)
+        game.events.clear()
+        self.tick_count += 1
+        t1 = time.perf_counter()
+        self.broadcast()
+        t2 = time.perf_counter()
+        self.sim_times.append(t1 - t0)
+        self.net_times.append(t2 - t1)
+
+    def broadcast(self):
+        game = self.game
+        tick = self.tick_count
+        if self.layout_version != game.layout_version:
+            self.layout_version = game.layout_version
+            self.obstacles = tuple(box.topleft for box in game.obstacles)
+        items = world_state(game)
+        for c in self.slots:
+            if c is None:
+                continue
+            p = game.players[c.slot]
+            view = interest(items, p.centerx, p.centery)
+            base_tick = c.acked if c.acked in c.sent else 0
+            base = c.sent[base_tick] if base_tick else {}
+            obstacles = self.obstacles if c.acked_layout != self.layout_version else None
+            data = encode_snapshot(tick, base_tick, base, view, c.last_applied, game, c.slot, obstacles)
+            self.sock.sendto(data, c.addr)
+            c.bytes_sent += len(data)
+            self.max_datagram = max(self.max_datagram, len(data))
+            c.sent[tick] = view
+            c.sent_layout[tick] = self.layout_version
+            old = tick - NET_HISTORY
+            c.sent.pop(old, None)
+            c.sent_layout.pop(old, None)
+
+    def run(self, wait_for=None, max_ticks=None):
+        """Loop em tempo real. wait_for: players conectados antes de começar."""
+        wait_for = len(self.slots) if wait_for is None else wait_for
+        while self.connected < wait_for:
+            self.poll()
+            time.sleep(0.01)
+        next_tick = time.perf_counter()
+        while not self.game.finished and self.connected and (max_ticks is None or self.tick_count < max_ticks):
+            self.poll()
+            self.tick()
+            next_tick += TICK_MS / 1000.0
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+
+# ---------------------------
+# Cliente
+# ---------------------------
+class Client:
+    """
+    Cliente: send_input() numera o comando, aplica no player local na hora
+    (previsão) e manda os ainda não confirmados; poll() recebe snapshots,
+    reconstrói a visão e corrige a previsão reaplicando os comandos que o
+    servidor ainda não processou.
+    """
+
+    def __init__(self, sock, server_addr):
+        self.sock = sock
+        sock.setblocking(False)
+        self.server = server_addr
+        self.slot = None
+        self.width = self.height = 0
+        self.player = None
+        self.obstacles = []
+        self.seq = 0
+        self.pending = deque()
+        self.predicted = {}
+        self.views = {}
+        self.view = {}
+        self.last_tick = 0
+        self.state = None
+        self.snapshots = 0
+        self.undecodable = 0
+        self.bad_packets = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.pred_errors = []
+        self.loss = 0.0
+        self.loss_rng = random.Random(1)
+
+    def hello(self):
+        self.sock.sendto(_HELLO.pack(HELLO, NET_VERSION), self.server)
+
+    def bye(self):
+        self.sock.sendto(bytes((BYE,)), self.server)
+
+    @property
+    def connected(self):
+        return self.slot is not None
+
+    def send_input(self, inp):
+        self.seq += 1
+        self.pending.append((self.seq, inp))
+        self._predict(inp)
+        if self.state is not None:
+            # antes do primeiro snapshot não há posição do servidor para comparar
+            self.predicted[self.seq] = self.player.topleft
+        commands = list(self.pending)[-NET_REDUNDANCY:]
+        buf = bytearray(_INPUT.pack(INPUT, self.last_tick, len(commands)))
+        for seq, cmd in commands:
+            encode_command(buf, seq, cmd)
+        self.sock.sendto(buf, self.server)
+        self.bytes_sent += len(buf)
+
+    def _predict(self, inp):
+        player = self.player
+        if player is None or player.life <= 0 or (self.state and self.state.flags & (FLAG_GAME_OVER | FLAG_GAME_WIN)):
+            return
+        player.set_direction(inp.dx, inp.dy)
+        player.move_and_collide(self.obstacles, self.width, self.height)
+
+    def poll(self):
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue
+            if self.loss and self.loss_rng.random() < self.loss:
+                continue
+            try:
+                self._handle(data)
+            except MALFORMED:
+                self.bad_packets += 1
+
+    def _handle(self, data):
+        if not data:
+            raise ValueError("datagrama vazio")
+        kind = data[0]
+        if kind == WELCOME:
+            _, self.slot, _, self.width, self.height = _WELCOME.unpack(data)
+            self.player = Player(0, 0, PLAYER_SIZE, PLAYER_SPEED)
+        elif kind == SNAPSHOT and self.slot is not None:
+            self.bytes_received += len(data)
+            self._on_snapshot(data)
+
+    def _on_snapshot(self, data):
+        decoded = decode_snapshot(data, self.views)
+        if decoded is None:
+            self.undecodable += 1
+            return
+        header, view = decoded
+        self.views[header.tick] = view
+        self.views.pop(header.tick - NET_HISTORY, None)
+        self.snapshots += 1
+        if header.tick <= self.last_tick:
+            return
+        self.last_tick = header.tick
+        self.view = view
+        self.state = header
+        if header.obstacles is not None:
+            self.obstacles = [pygame.Rect(x, y, BOX_SIZE, BOX_SIZE) for x, y in header.obstacles]
+        self._reconcile(header.last_seq, view.get(self.slot << 2 | KIND_PLAYER))
+
+    def _reconcile(self, last_seq, own):
+        if own is None:
+            return
+        qx, qy, life = own
+        x, y = qx // NET_QUANT, qy // NET_QUANT
+        guess = self.predicted.pop(last_seq, None)
+        if guess is not None:
+            self.pred_errors.append(abs(guess[0] - x) + abs(guess[1] - y))
+        for seq in [s for s in self.predicted if s < last_seq]:
+            del self.predicted[seq]
+        pending = self.pending
+        while pending and pending[0][0] <= last_seq:
+            pending.popleft()
+        player = self.player
+        player.topleft = (x, y)
+        player.life = life
+        for _, inp in pending:
+            self._predict(inp)
+
+    def zombies(self):
+        """Rects dos zumbis na visão atual."""
+        return [pygame.Rect(qx // NET_QUANT, qy // NET_QUANT, ENEMY_SIZE, ENEMY_SIZE)
+                for k, (qx, qy, _) in self.view.items() if k & 3 == KIND_ZOMBIE]
+
+    def as_game(self):
+        """Visão no formato que o Bot entende."""
+        return SimpleNamespace(player=self.player, enemies=self.zombies(),
+                               width=self.width, height=self.height)
+
+
+# ---------------------------
+# Loopback
+# ---------------------------
+def _stats(samples):
+    data = sorted(samples)
+    n = len(data)
+    if not n:
+        return {}
+    return {"mean": sum(data) / n * 1000.0, "p50": data[n // 2] * 1000.0,
+            "p99": data[min(n - 1, int(n * 0.99))] * 1000.0, "max": data[-1] * 1000.0}
+
+
+def loopback(players=4, zombies=500, ticks=600, seed=1, loss=0.0, width=1920, height=1080):
+    """
+    Servidor e `players` clientes bots num processo só, em sockets UDP reais
+    no 127.0.0.1, em lockstep (sem esperar o relógio). Confere cada visão
+    reconstruída pelo cliente com a que o servidor mandou e devolve banda,
+    tempos por tick e erro da previsão.
+    """
+    game = Game(width, height, seed=seed, players=players, spawn_init=zombies)
+    server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server_sock.bind(("127.0.0.1", 0))
+    server = Server(game, server_sock)
+    server.loss = loss
+    addr = server_sock.getsockname()
+
+    clients = []
+    for i in range(players):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        client = Client(sock, addr)
+        client.loss = loss
+        client.loss_rng = random.Random(seed * 100 + i)
+        clients.append(client)
+    for _ in range(100):
+        for c in clients:
+            if not c.connected:
+                c.hello()
+        time.sleep(0.001)
+        server.poll()
+        for c in clients:
+            c.poll()
+        if all(c.connected for c in clients):
+            break
+    else:
+        raise RuntimeError("clientes não conectaram no loopback")
+
+    bots = [Bot() for _ in clients]
+    mismatches = 0
+    checked = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for c, bot in zip(clients, bots):
+            c.send_input(bot.act(c.as_game()))
+        server.poll()
+        server.tick()
+        for c in clients:
+            c.poll()
+            sent = server.slots[c.slot].sent if server.slots[c.slot] is not None else {}
+            if c.last_tick in sent and c.state is not None and c.state.tick == c.last_tick:
+                checked += 1
+                if c.view != sent[c.last_tick]:
+                    mismatches += 1
+        if game.finished:
+            break
+    wall = time.perf_counter() - start
+    for c in clients:
+        c.bye()
+    server.poll()
+
+    n = server.tick_count
+    seconds = n / TICK_RATE
+    errors = [e for c in clients for e in c.pred_errors]
+    report = {
+        "players": players,
+        "zombies_start": zombies,
+        "zombies_end": len(game.enemies),
+        "ticks": n,
+        "loss": loss,
+        "wall_s": wall,
+        "tick_ms": {"sim": _stats(server.sim_times), "net": _stats(server.net_times)},
+        "per_client_kbps": {
+            "down": sum(r.bytes_received for r in clients) * 8 / 1000.0 / seconds / players,
+            "up": sum(r.bytes_sent for r in clients) * 8 / 1000.0 / seconds / players,
+        },
+        "max_datagram_bytes": server.max_datagram,
+        "views_checked": checked,
+        "view_mismatches": mismatches,
+        "undecodable_snapshots": sum(c.undecodable for c in clients),
+        "prediction_error_px": {
+            "mean": sum(errors) / len(errors) if errors else 0.0,
+            "max": max(errors) if errors else 0,
+            "exact": sum(1 for e in errors if e == 0) / len(errors) if errors else 1.0,
+        },
+        "result": game.summary(),
+    }
+    for s in [server_sock] + [c.sock for c in clients]:
+        s.close()
+    return report
+
+
+def run_client(host, port, max_ticks):
+    """Cliente bot em tempo real contra um servidor (sem tela)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client = Client(sock, (host, port))
+    deadline = time.monotonic() + 5.0
+    while not client.connected:
+        if time.monotonic() > deadline:
+            raise SystemExit("servidor não respondeu")
+        client.hello()
+        time.sleep(0.1)
+        client.poll()
+    bot = Bot()
+    next_tick = time.perf_counter()
+    for _ in range(max_ticks):
+        client.poll()
+        client.send_input(bot.act(client.as_game()))
+        if client.state is not None and client.state.flags & (FLAG_GAME_OVER | FLAG_GAME_WIN):
+            break
+        next_tick += TICK_MS / 1000.0
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+    client.bye()
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serve", action="store_true", help="roda o servidor autoritativo")
+    parser.add_argument("--connect", metavar="HOST:PORTA", help="cliente bot sem tela")
+    parser.add_argument("--loopback", action="store_true", help="servidor e clientes num processo só")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--zombies", type=int, default=20, help="zumbis na primeira wave")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=TICK_RATE * 60)
+    parser.add_argument("--loss", type=float, default=0.0, help="perda simulada (loopback)")
+    args = parser.parse_args()
+
+    if args.loopback:
+        print(json.dumps(loopback(args.players, args.zombies, args.ticks, args.seed, args.loss), indent=2))
+    elif args.serve:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("0.0.0.0", args.port))
+        server = Server(Game(1920, 1080, seed=args.seed, players=args.players,
+                             spawn_init=args.zombies), sock)
+        print(f"esperando {args.players} players na porta {args.port}", file=sys.stderr)
+        server.run(max_ticks=args.ticks)
+        print(json.dumps({"ticks": server.tick_count, "tick_ms": {"sim": _stats(server.sim_times),
+                                                                   "net": _stats(server.net_times)},
+                          "result": server.game.summary()}, indent=2))
+    elif args.connect:
+        host, _, port = args.connect.rpartition(":")
+        client = run_client(host, int(port), args.ticks)
+        print(json.dumps({"slot": client.slot, "snapshots": client.snapshots,
+                          "bytes_received": client.bytes_received, "bytes_sent": client.bytes_sent},
+                         indent=2))
+    else:
+        parser.error("use --serve, --connect ou --loopback")
+
+
+if __name__ == "__main__":
+    main()
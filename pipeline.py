@@ -0,0 +1,228 @@
+# pipeline.py
+# Modo em pipeline: a simulação roda numa thread própria, em passo fixo, e
+# publica snapshots imutáveis e compactos do estado (player, inimigos, balas,
+# HUD); a thread principal fica com os eventos do pygame, o desenho e o
+# present. Um flip lento (vsync, GPU) não atrasa a simulação e um tick pesado
+# não segura o frame.
+#
+# Handoff sem lock: a simulação monta um Snapshot novo a cada tick e troca uma
+# única referência (atribuição atômica no CPython); o render só lê essa
+# referência e nunca vê um snapshot pela metade. Cada snapshot leva a posição
+# do passo anterior e a do atual, então o render interpola entre os dois
+# últimos estados sem guardar nada. No sentido contrário, a direção do input
+# é um atributo e tiro/restart vão numa SimpleQueue, como os sons pedidos.
+#
+# Com o GIL, as duas threads só rodam juntas de verdade enquanto uma delas
+# está em código C que o solta (blits, flip). metrics() mede quanto os dois
+# estágios estiveram em andamento ao mesmo tempo (o que inclui esperar pelo
+# GIL; compare com ticks_per_s e com o FPS). Cada estágio publica desde quando
+# está ocupado (0.0 = parado) e, ao terminar, soma a interseção com o
+# intervalo do outro se ele ainda estiver ocupado; cada contador tem um único
+# escritor.
+import threading
+import time
+from array import array
+from queue import SimpleQueue, Empty
+
+from inputs import TickInput
+
+# atraso máximo (em ticks) antes de a simulação desistir de alcançar o relógio
+MAX_LAG_TICKS = 5
+
+
+class Snapshot:
+    """
+    Estado de um tick para desenhar. enemies e bullets: array de doubles,
+    4 por item (x anterior, y anterior, x, y).
+    """
+    __slots__ = ("tick", "published", "sim_time", "player", "life", "kills", "wave",
+                 "reloading", "game_win", "game_over", "enemies", "enemy_count",
+                 "bullets", "layout_version", "obstacles")
+
+    @property
+    def finished(self):
+        return self.game_over or self.game_win
+
+
+def capture(game, prev=None, tick=0):
+    """Snapshot do Game agora. prev: snapshot anterior (reaproveita os obstáculos)."""
+    s = Snapshot()
+    s.tick = tick
+    s.published = time.perf_counter()
+    s.sim_time = game.sim_time
+    p = game.player
+    s.player = (p.prev_x, p.prev_y, p.x, p.y, p.width, p.height)
+    s.life = p.life
+    s.kills = game.kill_count
+    s.wave = game.wave
+    s.reloading = game.reloading
+    s.game_win = game.game_win
+    s.game_over = game.game_over
+    s.enemies = array("d", [v for e in game.enemies for v in (e.prev_x, e.prev_y, e.x, e.y)])
+    s.enemy_count = len(game.enemies)
+    s.bullets = array("d", [v for b in game.bullets for v in (b.prev_x, b.prev_y, b.x, b.y)])
+    s.layout_version = game.layout_version
+    # obstáculos só mudam com o layout: copia uma vez por layout
+    if prev is not None and prev.layout_version == game.layout_version:
+        s.obstacles = prev.obstacles
+    else:
+        s.obstacles = tuple(box.topleft for box in game.obstacles)
+    return s
+
+
+class SimThread:
+    """
+    Roda game.apply() em passo fixo numa thread daemon. submit() entrega o
+    input do frame; latest é o snapshot mais recente; drain_events() devolve
+    os sons pedidos desde a última chamada. on_tick(inp, game), se dado, roda
+    na thread da simulação depois de cada tick (ex.: Recorder.record).
+    """
+
+    def __init__(self, game, tick_ms, on_tick=None):
+        self.game = game
+        self.tick_s = tick_ms / 1000.0
+        self.on_tick = on_tick
+        self.move = (0, 0)
+        self.commands = SimpleQueue()
+        self.events = SimpleQueue()
+        self.latest = capture(game)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+        # métricas: escritas por uma thread só cada, lidas no fim
+        self.ticks = 0
+        self.late_resyncs = 0
+        self.sim_busy = 0.0
+        self.frames = 0
+        self.fresh_frames = 0
+        self.render_busy = 0.0
+        self.sim_overlap = 0.0
+        self.render_overlap = 0.0
+        self.latency = 0.0
+        self._sim_since = 0.0
+        self._render_since = 0.0
+        self._seen_tick = -1
+        self._started = 0.0
+        self._stopped = 0.0
+
+    # ---------------------------
+    # Thread principal
+    # ---------------------------
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._stopped = time.perf_counter()
+
+    def submit(self, inp):
+        """Input do frame: a direção vale até o próximo submit; tiro e restart viram um comando."""
+        self.move = (inp.dx, inp.dy)
+        if inp.fire or inp.restart:
+            self.commands.put(inp)
+
+    def drain_events(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except Empty:
+                return events
+
+    def acquire(self):
+        """Começo do frame: snapshot a desenhar e o alpha de interpolação (0..1) dentro dele."""
+        snap = self.latest
+        now = time.perf_counter()
+        self._render_since = now
+        self.frames += 1
+        if snap.tick != self._seen_tick:
+            self._seen_tick = snap.tick
+            self.fresh_frames += 1
+            self.latency += now - snap.published
+        alpha = min(1.0, (now - snap.published) / self.tick_s)
+        return snap, alpha
+
+    def frame_done(self):
+        """Fim do frame (depois do present); a espera do clock fica de fora."""
+        now = time.perf_counter()
+        start = self._render_since
+        self.render_busy += now - start
+        since = self._sim_since
+        if since:
+            self.render_overlap += now - max(start, since)
+        self._render_since = 0.0
+
+    # ---------------------------
+    # Thread da simulação
+    # ---------------------------
+    def _next_input(self):
+        dx, dy = self.move
+        try:
+            cmd = self.commands.get_nowait()
+        except Empty:
+            return TickInput(dx, dy)
+        return TickInput(dx, dy, cmd.fire, cmd.aim_x, cmd.aim_y, cmd.restart)
+
+    def _run(self):
+        game = self.game
+        timer = time.perf_counter
+        tick_s = self.tick_s
+        next_tick = timer()
+        while not self._stop.is_set():
+            now = timer()
+            if now < next_tick:
+                self._stop.wait(next_tick - now)
+                continue
+            t0 = self._sim_since = timer()
+            inp = self._next_input()
+            game.apply(inp)
+            if self.on_tick is not None:
+                self.on_tick(inp, game)
+            for name in game.events:
+                self.events.put(name)
+            game.events.clear()
+            self.ticks += 1
+            self.latest = capture(game, self.latest, self.ticks)
+            t1 = timer()
+            self._sim_since = 0.0
+            self.sim_busy += t1 - t0
+            since = self._render_since
+            if since:
+                self.sim_overlap += t1 - max(t0, since)
+
+            next_tick += tick_s
+            if timer() - next_tick > tick_s * MAX_LAG_TICKS:
+                # atrasou demais (máquina lenta, debugger): volta ao relógio
+                next_tick = timer()
+                self.late_resyncs += 1
+
+    # ---------------------------
+    # Métricas
+    # ---------------------------
+    def metrics(self):
+        """
+        overlap_s: tempo em que simulação e render estiveram ocupados ao mesmo
+        tempo (perto de zero = os estágios se revezaram, sem paralelismo).
+        dropped: snapshots substituídos antes de algum frame vê-los.
+        """
+        wall = (self._stopped or time.perf_counter()) - self._started
+        overlap = self.sim_overlap + self.render_overlap
+        return {
+            "wall_s": wall,
+            "ticks": self.ticks,
+            "ticks_per_s": self.ticks / wall if wall > 0 else 0.0,
+            "frames": self.frames,
+            "fresh_frames": self.fresh_frames,
+            "repeated_frames": self.frames - self.fresh_frames,
+            "dropped_snapshots": max(0, self.ticks - self.fresh_frames),
+            "late_resyncs": self.late_resyncs,
+            "sim_busy_s": self.sim_busy,
+            "render_busy_s": self.render_busy,
+            "overlap_s": overlap,
+            "overlap_of_sim": overlap / self.sim_busy if self.sim_busy else 0.0,
+            "sim_utilization": self.sim_busy / wall if wall > 0 else 0.0,
+            "render_utilization": self.render_busy / wall if wall > 0 else 0.0,
+            "snapshot_latency_ms": self.latency / self.fresh_frames * 1000.0 if self.fresh_frames else 0.0,
+        }
@@ -0,0 +1,96 @@
+# placement.py
+# Posições de spawn sem sorteio com rejeição: as vagas livres ficam numa
+# lista e cada sorteio tira uma delas (troca com a última e pop), O(1).
+# Zumbis nascem em faixas fora da tela em volta das quatro bordas; caixas
+# numa grade de células sobre a arena, uma por célula, com deslocamento
+# aleatório dentro dela. Quando não há vaga, ArenaFull em vez de desistir
+# calado com menos do que foi pedido.
+import pygame
+
+# faixas de spawn em volta da arena (a primeira colada na borda); cada uma
+# tem ~2 * (largura + altura) / tamanho vagas
+EDGE_LAYERS = 32
+
+
+class ArenaFull(RuntimeError):
+    pass
+
+
+class SlotList:
+    """Vagas livres; take() sorteia e remove uma em O(1)."""
+
+    def __init__(self, slots=()):
+        self.free = list(slots)
+
+    def __len__(self):
+        return len(self.free)
+
+    def extend(self, slots):
+        self.free.extend(slots)
+
+    def take(self, rng):
+        free = self.free
+        if not free:
+            raise ArenaFull("nenhuma vaga livre")
+        i = rng.randrange(len(free))
+        free[i], free[-1] = free[-1], free[i]
+        return free.pop()
+
+
+def edge_ring(width, height, size, layer):
+    """Vagas (x, y) da faixa `layer` fora da tela: uma linha acima, uma abaixo
+    e uma coluna de cada lado, espaçadas de `size` (não se sobrepõem)."""
+    out = size * layer
+    top = -size - out
+    left = -size - out
+    slots = [(x, top) for x in range(0, width - size + 1, size)]
+    slots += [(x, height + out) for x in range(0, width - size + 1, size)]
+    slots += [(left, y) for y in range(0, height - size + 1, size)]
+    slots += [(width + out, y) for y in range(0, height - size + 1, size)]
+    return slots
+
+
+class EdgeSpawner:
+    """
+    Vagas para zumbis de uma wave. Esgotada uma faixa, abre a próxima mais
+    para fora; reset() no começo de cada wave volta para a faixa colada na borda.
+    """
+
+    def __init__(self, width, height, size, max_layers=EDGE_LAYERS):
+        self.width = width
+        self.height = height
+        self.size = size
+        self.max_layers = max_layers
+        self.slots = SlotList()
+        self.reset()
+
+    def reset(self):
+        self.layer = 0
+        self.slots.free[:] = edge_ring(self.width, self.height, self.size, 0)
+
+    @property
+    def capacity(self):
+        return sum(len(edge_ring(self.width, self.height, self.size, layer))
+                   for layer in range(self.max_layers))
+
+    def take(self, rng):
+        if not self.slots:
+            if self.layer + 1 >= self.max_layers:
+                raise ArenaFull(f"sem vaga para spawn: as {self.max_layers} faixas em volta "
+                                f"da arena estão ocupadas ({self.capacity} zumbis)")
+            self.layer += 1
+            self.slots.extend(edge_ring(self.width, self.height, self.size, self.layer))
+        return self.slots.take(rng)
+
+
+def grid_cells(width, height, pitch, keep_clear=None):
+    """Cantos (x, y) das células pitch x pitch que cabem na arena e não
+    encostam em keep_clear (ex.: onde o player nasce)."""
+    cell = pygame.Rect(0, 0, pitch, pitch)
+    cells = []
+    for x in range(0, width - pitch + 1, pitch):
+        for y in range(0, height - pitch + 1, pitch):
+            cell.topleft = (x, y)
+            if keep_clear is None or not cell.colliderect(keep_clear):
+                cells.append((x, y))
+    return cells
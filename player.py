@@ -1,18 +1,5 @@
 import pygame
-import os
-import sys
-
-def asset_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except:
-        base_path = os.path.abspath(".")
-
-    return os.path.join(base_path, relative_path)
-
-pygame.mixer.init()
-player_hurt_sound = pygame.mixer.Sound(asset_path("assets/hurt.mp3"))
-player_hurt_sound.set_volume(0.5)
+from spatial import obstacle_candidates
 
 class Player(pygame.Rect):
     def __init__(self, x, y, size, speed):
@@ -22,39 +9,39 @@ class Player(pygame.Rect):
         self.vel_y = 0
         self.life = 3
         self.invincible = False
-        self.invincible_timer = 0
         self.invincible_cooldown = 1000
-
-    def handle_input(self, WIDTH, HEIGHT):
-        keys = pygame.key.get_pressed()
+        self.prev_x = x
+        self.prev_y = y
         self.velocity = pygame.math.Vector2(0, 0)
+        # munição (cada player tem a sua; o Game agenda o fim do recarregamento)
+        self.shots_fired = 0
+        self.reloading = False
 
-        if keys[pygame.K_w]:
-            self.velocity.y = -1
-        if keys[pygame.K_s]:
-            self.velocity.y = 1
-        if keys[pygame.K_a]:
-            self.velocity.x = -1
-        if keys[pygame.K_d]:
-            self.velocity.x = 1
-
+    def set_direction(self, dx, dy):
+        """Direção de movimento vinda do input (teclado, bot ou replay)."""
+        self.velocity = pygame.math.Vector2(dx, dy)
         if self.velocity.length() > 0:
             self.velocity = self.velocity.normalize() * self.speed
 
-    def update_invincible(self):
-        if self.invincible and pygame.time.get_ticks() - self.invincible_timer >= self.invincible_cooldown:
-            self.invincible = False
-
     def take_damage(self):
-        if not self.invincible:
-            player_hurt_sound.play()
-            self.life -= 1
-            self.invincible = True
-            self.invincible_timer = pygame.time.get_ticks()
+        """Perde uma vida se não estiver invencível. Retorna True se tomou o dano
+        (quem chamou agenda end_invincible para daqui a invincible_cooldown ms)."""
+        if self.invincible:
+            return False
+        self.life -= 1
+        self.invincible = True
+        return True
+
+    def end_invincible(self):
+        self.invincible = False
+
+    def finish_reload(self):
+        self.shots_fired = 0
+        self.reloading = False
 
     def move_and_collide(self, obstacles, WIDTH, HEIGHT):
         self.x += self.velocity.x
-        for box in obstacles:
+        for box in obstacle_candidates(obstacles, self):
             if self.colliderect(box):
                 if self.velocity.x > 0:
                     self.right = box.left
@@ -62,7 +49,7 @@ class Player(pygame.Rect):
                     self.left = box.right
 
         self.y += self.velocity.y
-        for box in obstacles:
+        for box in obstacle_candidates(obstacles, self):
             if self.colliderect(box):
                 if self.velocity.y > 0:
                     self.bottom = box.top
@@ -0,0 +1,76 @@
+# pool.py
+import gc
+import sys
+
+
+class Pool:
+    """
+    Pool de objetos reutilizáveis. `factory(*args)` cria um objeto novo e
+    `obj.reset(*args)` reinicia um objeto devolvido com release().
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        self.free.append(obj)
+
+    def release_all(self, items):
+        """Devolve todos os itens da lista ao pool e esvazia a lista."""
+        self.free.extend(items)
+        items.clear()
+
+
+class AllocationStats:
+    """
+    Contagem de alocações por frame, para depuração: objetos novos criados
+    pelos pools, blocos de memória líquidos (sys.getallocatedblocks) e
+    coletas do GC. Chame begin_frame()/end_frame() em volta do tick; só mede
+    com enabled = True (desligado, não custa nada por tick).
+    """
+
+    def __init__(self, pools, enabled=False):
+        self.pools = pools
+        self.enabled = enabled
+        self.last = {}
+        self._start = None
+
+    def _counts(self):
+        return ({name: (p.created, p.reused) for name, p in self.pools.items()},
+                sum(s["collections"] for s in gc.get_stats()))
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        # blocos medidos por último no começo e primeiro no fim: o que a
+        # própria medição aloca não entra na conta
+        pools, gcs = self._counts()
+        self._start = (pools, gcs, sys.getallocatedblocks())
+
+    def end_frame(self):
+        if self._start is None:
+            return
+        blocks1 = sys.getallocatedblocks()
+        pools0, gcs0, blocks0 = self._start
+        pools1, gcs1 = self._counts()
+        self.last = {
+            "pools": {name: {"created": pools1[name][0] - pools0[name][0],
+                             "reused": pools1[name][1] - pools0[name][1],
+                             "free": len(self.pools[name].free)}
+                      for name in self.pools},
+            "net_blocks": blocks1 - blocks0,
+            "gc_collections": gcs1 - gcs0,
+        }
+        self._start = None
@@ -0,0 +1,185 @@
+# profiler.py
+# Profiler por fase do frame: timers de alta resolução em volta de cada fase
+# e subfase (eventos, update dos inimigos, colisões das balas, sprites, HUD,
+# present), histórico móvel dos últimos frames, overlay na tela e exportação
+# em trace JSON do Chrome (chrome://tracing, Perfetto) ou CSV.
+#
+# Desligado, section() devolve sempre o mesmo contexto vazio: o custo é uma
+# chamada de método por fase, sem relógio nem alocação.
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+_NULL = nullcontext()
+
+# limites (ms) das faixas do histograma de tempo de frame
+FRAME_BUCKETS = (4.0, 8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0)
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.t0, time.perf_counter())
+
+
+class Profiler:
+    """
+    begin_frame()/end_frame() em volta do frame; `with profiler.section(nome)`
+    em volta de cada fase (pode aninhar). record=True guarda a sessão inteira
+    para write_trace()/write_csv(); sem isso só fica o histórico móvel.
+    """
+
+    def __init__(self, history=240, enabled=False, record=False):
+        self.enabled = enabled
+        self.record = record
+        self.show_overlay = False
+        self.frames = deque(maxlen=history)
+        self.phases = {}
+        self.current = {}
+        self.counts = {}
+        self.frame_start = 0.0
+        self.frame_index = 0
+        self.epoch = time.perf_counter()
+        self.trace = []
+        self.rows = []
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        # escondido, só continua medindo se está gravando (--trace/--profile-csv)
+        self.enabled = self.show_overlay or self.record
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL
+        return _Section(self, name)
+
+    def add(self, name, t0, t1):
+        self.current[name] = self.current.get(name, 0.0) + (t1 - t0)
+        if self.record:
+            self.trace.append((name, t0, t1))
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self, **counts):
+        """Fecha o frame; counts: contadores do frame (ex.: enemies=, bullets=, blits=)."""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        total = (end - self.frame_start) * 1000.0
+        self.frames.append(total)
+        history = self.frames.maxlen
+        for name in self.current.keys() | self.phases.keys():
+            values = self.phases.get(name)
+            if values is None:
+                values = self.phases[name] = deque(maxlen=history)
+            values.append(self.current.get(name, 0.0) * 1000.0)
+        self.counts = counts
+        if self.record:
+            self.trace.append(("frame", self.frame_start, end))
+            self.rows.append((self.frame_index, total,
+                              {k: v * 1000.0 for k, v in self.current.items()}, counts))
+        self.frame_index += 1
+
+    # ---------------------------
+    # Estatísticas
+    # ---------------------------
+    def histogram(self):
+        """Contagem de frames por faixa de tempo no histórico móvel."""
+        counts = [0] * (len(FRAME_BUCKETS) + 1)
+        for ms in self.frames:
+            i = 0
+            while i < len(FRAME_BUCKETS) and ms > FRAME_BUCKETS[i]:
+                i += 1
+            counts[i] += 1
+        labels = [f"<={b:g}" for b in FRAME_BUCKETS] + [f">{FRAME_BUCKETS[-1]:g}"]
+        return dict(zip(labels, counts))
+
+    def summary(self):
+        def stats(values):
+            data = sorted(values)
+            n = len(data)
+            return {"mean": sum(data) / n, "p99": data[min(n - 1, int(n * 0.99))], "max": data[-1]}
+
+        if not self.frames:
+            return {}
+        return {
+            "frame_ms": stats(self.frames),
+            "phases_ms": {name: stats(v) for name, v in sorted(self.phases.items()) if v},
+            "histogram": self.histogram(),
+            "counts": dict(self.counts),
+        }
+
+    # ---------------------------
+    # Overlay
+    # ---------------------------
+    def overlay(self, font, width=360, graph_height=80, budget_ms=1000.0 / 60):
+        """Surface com o gráfico de tempo de frame e os números do último frame."""
+        lines = []
+        if self.frames:
+            frames = self.frames
+            avg = sum(frames) / len(frames)
+            lines.append(f"frame {frames[-1]:.2f} ms  média {avg:.2f}  max {max(frames):.2f}")
+            for name, values in sorted(self.phases.items()):
+                lines.append(f"{name:<22}{values[-1]:7.2f} ms")
+            lines.append("  ".join(f"{k} {v}" for k, v in self.counts.items()))
+
+        line_h = font.get_linesize()
+        surf = pygame.Surface((width, graph_height + 8 + line_h * len(lines)), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+
+        # gráfico: uma barra por frame, escala até 2x o orçamento
+        scale = graph_height / (budget_ms * 2)
+        n = len(self.frames)
+        for i, ms in enumerate(self.frames):
+            x = width - n + i
+            h = min(graph_height, int(ms * scale))
+            color = (80, 220, 80) if ms <= budget_ms else (230, 70, 70)
+            pygame.draw.line(surf, color, (x, graph_height), (x, graph_height - h))
+        budget_y = graph_height - int(budget_ms * scale)
+        pygame.draw.line(surf, (255, 255, 0), (0, budget_y), (width, budget_y))
+
+        y = graph_height + 4
+        for text in lines:
+            surf.blit(font.render(text, True, (255, 255, 255)), (6, y))
+            y += line_h
+        return surf
+
+    # ---------------------------
+    # Exportação
+    # ---------------------------
+    def write_trace(self, path):
+        """Trace-event JSON (abre em chrome://tracing ou ui.perfetto.dev)."""
+        epoch = self.epoch
+        events = [{"name": name, "ph": "X", "pid": 1, "tid": 1,
+                   "ts": (t0 - epoch) * 1e6, "dur": (t1 - t0) * 1e6}
+                  for name, t0, t1 in self.trace]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def write_csv(self, path):
+        """Uma linha por frame: tempo total, tempo de cada fase e contadores."""
+        phases = sorted({name for _, _, p, _ in self.rows for name in p})
+        counters = sorted({name for _, _, _, c in self.rows for name in c})
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + phases + counters)
+            for index, total, p, c in self.rows:
+                writer.writerow([index, f"{total:.4f}"] + [f"{p.get(n, 0.0):.4f}" for n in phases]
+                                + [c.get(n, "") for n in counters])
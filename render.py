@@ -0,0 +1,107 @@
+# render.py
+import pygame
+
+
+class DirtyRenderer:
+    """
+    Renderização por retângulos sujos: guarda os rects desenhados no frame
+    anterior e no atual, restaura só essas áreas do background e chama
+    pygame.display.update(rects). Se a área suja passar de `threshold`
+    (fração da tela), ou se dirty=False, volta para blit completo + flip.
+    """
+
+    def __init__(self, screen, background, dirty=True, threshold=0.35):
+        self.screen = screen
+        self.background = background
+        self.dirty = dirty
+        self.threshold = threshold
+        self.prev = []
+        self.curr = []
+        self.restored = []
+        self.full = True
+        self.last_was_full = True
+
+    def invalidate(self):
+        """Força um frame completo (ex.: background ou obstáculos mudaram)."""
+        self.full = True
+
+    def set_background(self, background):
+        self.background = background
+        self.invalidate()
+
+    def bake(self, base, image, positions):
+        """
+        Usa como background uma cópia de `base` com `image` já desenhada em
+        cada posição (obstáculos): restaurar uma área do fundo traz as caixas
+        junto, sem redesenhá-las a cada frame. Chamar de novo a cada layout.
+        """
+        static = base.copy()
+        static.blits([(image, pos) for pos in positions], doreturn=False)
+        self.set_background(static)
+
+    def begin(self):
+        screen = self.screen
+        if self.full or not self.dirty:
+            screen.blit(self.background, (0, 0))
+            self.restored = [screen.get_rect()]
+        else:
+            background = self.background
+            screen.blits([(background, r, r) for r in self.prev], doreturn=False)
+            self.restored = self.prev
+        self.curr = []
+
+    def blit(self, surf, pos, area=None):
+        r = self.screen.blit(surf, pos, area)
+        self.curr.append(r)
+        return r
+
+    def blits(self, sequence):
+        """Vários blits numa chamada só (Surface.blits); sequence: (surf, pos)."""
+        rects = self.screen.blits(sequence)
+        self.curr.extend(rects)
+        return rects
+
+    def mark(self, rect):
+        self.curr.append(rect)
+        return rect
+
+    def present(self):
+        full = self.full or not self.dirty
+        if not full:
+            rects = self.prev + self.curr
+            sw, sh = self.screen.get_size()
+            area = sum(r.width * r.height for r in rects)
+            full = area > self.threshold * sw * sh
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.last_was_full = full
+        self.prev = self.curr
+        self.full = False
+
+
+class SpriteBatch:
+    """
+    Junta os blits de sprites do frame, separados por camada (0 embaixo), e
+    manda tudo de uma vez com DirtyRenderer.blits(): uma chamada de C por
+    frame em vez de uma por sprite.
+    """
+
+    def __init__(self, layers):
+        self.layers = [[] for _ in range(layers)]
+
+    def add(self, layer, surf, pos):
+        self.layers[layer].append((surf, pos))
+
+    def __len__(self):
+        return sum(len(layer) for layer in self.layers)
+
+    def flush(self, renderer):
+        sequence = []
+        for layer in self.layers:
+            sequence += layer
+            layer.clear()
+        if sequence:
+            renderer.blits(sequence)
+        return len(sequence)
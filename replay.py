@@ -0,0 +1,252 @@
+# replay.py
+# Gravação e reprodução determinística de partidas. O replay guarda a seed,
+# os parâmetros do Game e só as mudanças de input por tick; a reprodução
+# refaz a simulação sem tela, o mais rápido possível, conferindo um hash do
+# estado a cada N ticks e medindo o tempo de cada tick (travadas relatadas
+# por jogadores viram casos de teste de desempenho reproduzíveis).
+#
+# Formato (little-endian):
+#   cabeçalho: MAGIC | versão u16 | seed u64 | largura u16 | altura u16
+#              | tick rate u16 | hash a cada u16 | tamanho u16 + parâmetros JSON
+#   registros: ticks pulados (varint) | flags u8 | dados conforme as flags
+#     MOVE    -> u8 (dx + 1) * 3 + (dy + 1)
+#     FIRE    -> mira i16, i16
+#     RESTART -> (sem dados)
+#     HASH    -> u64 do Game.state_hash() depois do tick
+#     END     -> fim; os ticks pulados antes dele ainda são simulados
+#   Ticks pulados repetem o último movimento, sem tiro nem restart.
+#
+# Uso:
+#   python main.py --record sessao.bzrp          # grava jogando
+#   python replay.py sessao.bzrp                 # reproduz e confere
+#   python replay.py --record-bot bot.bzrp --seed 7 --ticks 20000
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+
+# a simulação não abre tela nem mixer; só esconde a mensagem do pygame
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game import Game, TICK_RATE
+from inputs import TickInput
+
+MAGIC = b"BZRP"
+# sobe a cada mudança na simulação (RNG, spawn, colisão): replay antigo divergiria
+VERSION = 5
+HASH_EVERY = 60
+_HEADER = struct.Struct("<4sHQHHHHH")
+_AIM = struct.Struct("<hh")
+_HASH = struct.Struct("<Q")
+
+MOVE = 1
+FIRE = 2
+RESTART = 4
+HASH = 8
+END = 128
+
+
+def _write_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class Recorder:
+    """Grava os inputs aplicados num Game. Chame record() depois de cada game.apply()."""
+
+    def __init__(self, game, hash_every=HASH_EVERY):
+        self.seed = game.seed
+        self.width = game.width
+        self.height = game.height
+        self.params = game.params
+        self.hash_every = hash_every
+        self.records = bytearray()
+        self.tick = 0
+        self.last_tick = 0
+        self.move = (0, 0)
+
+    def record(self, inp, game):
+        self.tick += 1
+        flags = 0
+        move = (inp.dx, inp.dy)
+        if move != self.move:
+            flags |= MOVE
+            self.move = move
+        if inp.fire:
+            flags |= FIRE
+        if inp.restart:
+            flags |= RESTART
+        if self.tick % self.hash_every == 0:
+            flags |= HASH
+        if not flags:
+            return
+        buf = self.records
+        _write_varint(buf, self.tick - self.last_tick - 1)
+        buf.append(flags)
+        if flags & MOVE:
+            buf.append((inp.dx + 1) * 3 + (inp.dy + 1))
+        if flags & FIRE:
+            buf += _AIM.pack(inp.aim_x, inp.aim_y)
+        if flags & HASH:
+            buf += _HASH.pack(game.state_hash())
+        self.last_tick = self.tick
+
+    def to_bytes(self):
+        params = json.dumps(self.params).encode("utf-8")
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height,
+                                     TICK_RATE, self.hash_every, len(params)))
+        out += params
+        out += self.records
+        _write_varint(out, self.tick - self.last_tick)
+        out.append(END)
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    def __init__(self, data):
+        magic, version, seed, width, height, tick_rate, hash_every, params_len = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("arquivo não é um replay desta versão")
+        start = _HEADER.size
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.hash_every = hash_every
+        self.params = json.loads(data[start:start + params_len].decode("utf-8"))
+        self.data = data
+        self.start = start + params_len
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def ticks(self):
+        """Gera (TickInput, hash esperado ou None) para cada tick."""
+        data = self.data
+        pos = self.start
+        dx = dy = 0
+        while True:
+            skip, pos = _read_varint(data, pos)
+            for _ in range(skip):
+                yield TickInput(dx, dy), None
+            flags = data[pos]
+            pos += 1
+            if flags & END:
+                return
+            if flags & MOVE:
+                code = data[pos]
+                pos += 1
+                dx, dy = code // 3 - 1, code % 3 - 1
+            inp = TickInput(dx, dy, restart=bool(flags & RESTART))
+            if flags & FIRE:
+                inp.fire = True
+                inp.aim_x, inp.aim_y = _AIM.unpack_from(data, pos)
+                pos += _AIM.size
+            expected = None
+            if flags & HASH:
+                expected, = _HASH.unpack_from(data, pos)
+                pos += _HASH.size
+            yield inp, expected
+
+
+def play(replay, slowest=10):
+    """Reproduz o replay na velocidade máxima. Retorna um relatório (dict)."""
+    if replay.tick_rate != TICK_RATE:
+        raise ValueError(f"replay gravado a {replay.tick_rate} ticks/s, o jogo roda a {TICK_RATE}")
+    game = Game(replay.width, replay.height, seed=replay.seed, **replay.params)
+    timer = time.perf_counter
+    times = []
+    checked = 0
+    mismatch = None
+    start = timer()
+    for tick, (inp, expected) in enumerate(replay.ticks(), 1):
+        t0 = timer()
+        game.apply(inp)
+        times.append(timer() - t0)
+        game.events.clear()
+        if expected is not None:
+            if game.state_hash() != expected:
+                mismatch = tick
+                break
+            checked += 1
+    wall = timer() - start
+
+    ordered = sorted(range(len(times)), key=times.__getitem__, reverse=True)
+    data = sorted(times)
+    n = len(data)
+    return {
+        "ticks": n,
+        "hash_checks": checked,
+        "diverged_at": mismatch,
+        "wall_s": wall,
+        "ticks_per_s": n / wall if wall > 0 else 0.0,
+        "tick_ms": {
+            "p50": data[n // 2] * 1000.0 if n else 0.0,
+            "p99": data[min(n - 1, int(n * 0.99))] * 1000.0 if n else 0.0,
+            "max": data[-1] * 1000.0 if n else 0.0,
+        },
+        "slowest": [{"tick": i + 1, "ms": times[i] * 1000.0} for i in ordered[:slowest]],
+        "result": game.summary(),
+    }
+
+
+def record_bot(path, seed, max_ticks, hash_every=HASH_EVERY):
+    """Grava uma partida jogada pelo Bot (útil para gerar casos sem tela)."""
+    from bot import Bot
+    game = Game(1920, 1080, seed=seed)
+    recorder = Recorder(game, hash_every)
+    bot = Bot()
+    while recorder.tick < max_ticks and not game.finished:
+        inp = bot.act(game)
+        game.apply(inp)
+        game.events.clear()
+        recorder.record(inp, game)
+    recorder.save(path)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("replay", nargs="?", help="arquivo .bzrp para reproduzir")
+    parser.add_argument("--record-bot", metavar="ARQUIVO", help="grava uma partida do bot")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=TICK_RATE * 60 * 10)
+    args = parser.parse_args()
+
+    if args.record_bot:
+        rec = record_bot(args.record_bot, args.seed, args.ticks)
+        print(f"{rec.tick} ticks gravados em {args.record_bot} ({os.path.getsize(args.record_bot)} bytes)")
+        return
+    if not args.replay:
+        parser.error("informe um replay ou --record-bot")
+
+    report = play(Replay.load(args.replay))
+    print(json.dumps(report, indent=2))
+    if report["diverged_at"] is not None:
+        print(f"[ERRO] estado divergiu no tick {report['diverged_at']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# rotcache.py
+import pygame
+
+ROTATION_STEPS = 64
+
+
+class RotationCache:
+    """
+    Guarda um sprite pré-rotacionado em N ângulos quantizados, junto com o
+    deslocamento que centraliza cada rotação. Desenhar vira lookup + blit.
+    Com lazy=True cada ângulo só é gerado na primeira vez que é usado.
+    """
+
+    def __init__(self, image, steps=ROTATION_STEPS, lazy=True):
+        self.image = image
+        self.steps = steps
+        self.frames = [None] * steps
+        if not lazy:
+            for i in range(steps):
+                self._bake(i)
+
+    def _bake(self, i):
+        surf = pygame.transform.rotate(self.image, i * 360.0 / self.steps)
+        w, h = surf.get_size()
+        frame = (surf, (-(w // 2), -(h // 2)))
+        self.frames[i] = frame
+        return frame
+
+    def get(self, angle):
+        """Retorna (surface, (dx, dy)); blit em (cx + dx, cy + dy) fica centralizado."""
+        i = int(round(angle * self.steps / 360.0)) % self.steps
+        frame = self.frames[i]
+        if frame is None:
+            frame = self._bake(i)
+        return frame
+
+    def place(self, angle, cx, cy):
+        """(surface, (x, y)) centralizado em (cx, cy), pronto para um SpriteBatch."""
+        surf, (dx, dy) = self.get(angle)
+        return surf, (cx + dx, cy + dy)
+
+    def blit_centered(self, screen, angle, cx, cy):
+        surf, (dx, dy) = self.get(angle)
+        return screen.blit(surf, (cx + dx, cy + dy))
+
+    def baked(self):
+        return sum(1 for f in self.frames if f is not None)
+
+    def memory_bytes(self):
+        total = 0
+        for f in self.frames:
+            if f is not None:
+                surf = f[0]
+                total += surf.get_pitch() * surf.get_height()
+        return total
+
+
+def memory_report(caches):
+    """Resumo de memória de um dict nome -> RotationCache."""
+    return {name: {"baked": c.baked(), "steps": c.steps, "bytes": c.memory_bytes()}
+            for name, c in caches.items()}
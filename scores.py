@@ -0,0 +1,304 @@
+# scores.py
+# Placar local persistente (maiores pontuações e estatísticas de cada partida).
+#
+# No diretório do placar (SCORES_DIR):
+#   runs.log  log só de acréscimo: um registro RECORD por partida, nunca reescrito
+#   top.idx   índice compactado: HEADER + até top_n registros ordenados (maior
+#             pontuação primeiro); `covered` diz até que byte do log ele já contém
+#
+# Registro (little-endian, 36 bytes): crc32 do resto u32 | timestamp f64 |
+# pontuação u32 | kills u32 | wave u8 | venceu u8 | vidas perdidas u8 | pad |
+# tiros u32 | acertos u32 | duração em ms u32
+#
+# O jogo só chama submit(), que põe a partida numa fila e volta na hora; uma
+# thread grava no log (flush + fsync), atualiza o ranking em memória e, a cada
+# COMPACT_EVERY partidas (e no close), reescreve o índice num arquivo temporário
+# trocado com os.replace. Ao abrir, o índice é lido por mmap (tamanho fixo, sem
+# parse de texto) e só a cauda do log depois de `covered` é percorrida; um
+# registro cortado no fim (queda no meio da escrita) é descartado, e um com crc
+# errado no meio (bit trocado) é pulado, sem apagar os que vêm depois. O ranking
+# pronto fica em `top` (tupla trocada por atribuição), então a tela de game over
+# lê sem lock e sem tocar no disco.
+#
+# Uso: python scores.py [--dir DIRETÓRIO] [--all]
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from queue import SimpleQueue
+
+# ---------------------------
+# Constantes / Configurações
+# ---------------------------
+TOP_N = 10
+COMPACT_EVERY = 8
+POINTS_PER_KILL = 100
+WIN_BONUS = 1000
+
+MAGIC = b"BZSC"
+VERSION = 1
+RECORD = struct.Struct("<IdIIBBBxIII")
+HEADER = struct.Struct("<4sHHQ")
+LOG_NAME = "runs.log"
+INDEX_NAME = "top.idx"
+
+
+def default_data_dir():
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_DATA_HOME")
+            or os.path.join(os.path.expanduser("~"), ".local", "share"))
+    return os.path.join(base, "battlezone")
+
+
+SCORES_DIR = os.environ.get("BATTLEZONE_SCORES", default_data_dir())
+
+
+class Run:
+    """Uma partida no placar."""
+    __slots__ = ("timestamp", "score", "kills", "wave", "won", "lives_lost",
+                 "shots", "hits", "duration_ms")
+
+    def __init__(self, timestamp, score, kills, wave, won, lives_lost, shots, hits, duration_ms):
+        self.timestamp = timestamp
+        self.score = score
+        self.kills = kills
+        self.wave = wave
+        self.won = won
+        self.lives_lost = lives_lost
+        self.shots = shots
+        self.hits = hits
+        self.duration_ms = duration_ms
+
+    @classmethod
+    def from_game(cls, game, timestamp=None):
+        """Partida que acabou de terminar no Game."""
+        s = game.summary()
+        return cls(time.time() if timestamp is None else timestamp,
+                   s["kills"] * POINTS_PER_KILL + (WIN_BONUS if s["won"] else 0),
+                   s["kills"], s["wave"], s["won"], s["damage_taken"],
+                   s["shots"], s["hits"], int(game.sim_time))
+
+    @property
+    def accuracy(self):
+        return self.hits / self.shots if self.shots else 0.0
+
+    def sort_key(self):
+        # maior pontuação; empate: mais rápido, depois o mais antigo
+        return (-self.score, self.duration_ms, self.timestamp)
+
+    def pack(self):
+        body = RECORD.pack(0, self.timestamp, self.score, self.kills, min(self.wave, 255),
+                           bool(self.won), min(self.lives_lost, 255), self.shots, self.hits,
+                           self.duration_ms)[4:]
+        return struct.pack("<I", zlib.crc32(body)) + body
+
+    @classmethod
+    def unpack_from(cls, data, offset=0):
+        """Registro em data[offset:]; None se o crc não bate."""
+        crc, *fields = RECORD.unpack_from(data, offset)
+        if zlib.crc32(data[offset + 4:offset + RECORD.size]) != crc:
+            return None
+        timestamp, score, kills, wave, won, lives_lost, shots, hits, duration_ms = fields
+        return cls(timestamp, score, kills, wave, bool(won), lives_lost, shots, hits, duration_ms)
+
+
+def _mapped(path):
+    """(arquivo, mmap só leitura) ou None se não existe ou está vazio."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    if os.fstat(f.fileno()).st_size == 0:
+        f.close()
+        return None
+    return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_index(path):
+    """Índice compactado: (partidas em ordem, bytes do log cobertos). Índice
+    ausente ou inválido vale ([], 0): o log é relido inteiro."""
+    opened = _mapped(path)
+    if opened is None:
+        return [], 0
+    f, data = opened
+    with f, data:
+        if len(data) < HEADER.size:
+            return [], 0
+        magic, version, n, covered = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or len(data) < HEADER.size + n * RECORD.size:
+            return [], 0
+        runs = [Run.unpack_from(data, HEADER.size + i * RECORD.size) for i in range(n)]
+    if None in runs:
+        return [], 0
+    return runs, covered
+
+
+def read_log(path, offset=0):
+    """Partidas do log a partir de `offset`: (partidas, fim do último registro
+    inteiro). Registro com crc errado é pulado (o tamanho é fixo, então o
+    próximo continua alinhado); só sobra depois do fim os bytes de um
+    registro cortado."""
+    opened = _mapped(path)
+    if opened is None:
+        return [], 0
+    f, data = opened
+    runs = []
+    with f, data:
+        end = len(data)
+        if offset > end:
+            # log menor do que o índice diz (apagado ou trocado): nada novo
+            return [], end
+        pos = offset
+        while pos + RECORD.size <= end:
+            run = Run.unpack_from(data, pos)
+            if run is not None:
+                runs.append(run)
+            pos += RECORD.size
+    return runs, pos
+
+
+class ScoreStore:
+    """
+    Placar com gravação em background. submit(run) não bloqueia; `top` é o
+    ranking atual (tupla de Run) e `last` o (Run, posição) da última partida
+    registrada (posição None = fora do top). ready é setado quando o placar
+    do disco terminou de carregar. Erro de disco não derruba o jogo: fica em
+    `error` e o placar continua em memória.
+    """
+
+    def __init__(self, directory=SCORES_DIR, top_n=TOP_N, compact_every=COMPACT_EVERY):
+        self.directory = directory
+        self.log_path = os.path.join(directory, LOG_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self.top_n = top_n
+        self.compact_every = compact_every
+        self.top = ()
+        self.last = None
+        self.runs_logged = 0
+        self.compactions = 0
+        self.error = None
+        self.ready = threading.Event()
+        self._log = None
+        self._log_end = 0
+        self._queue = SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="scores", daemon=True)
+        self._thread.start()
+
+    def submit(self, run):
+        self._queue.put(run)
+
+    def close(self):
+        """Grava o que falta, compacta e encerra a thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    # ---------------------------
+    # Thread de gravação
+    # ---------------------------
+    def _run(self):
+        try:
+            self._load()
+        except OSError as e:
+            self.error = e
+        self.ready.set()
+        pending = 0
+        while True:
+            run = self._queue.get()
+            if run is None:
+                break
+            self._append(run)
+            self._publish(run)
+            pending += 1
+            if pending >= self.compact_every:
+                self.compact()
+                pending = 0
+        if pending:
+            self.compact()
+        if self._log is not None:
+            self._log.close()
+
+    def _load(self):
+        runs, covered = read_index(self.index_path)
+        tail, end = read_log(self.log_path, covered)
+        self._log_end = end
+        self.runs_logged = end // RECORD.size
+        self.top = tuple(sorted(runs + tail, key=Run.sort_key)[:self.top_n])
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > end:
+            # registro cortado no fim do log (menos de RECORD.size bytes):
+            # descarta antes de acrescentar
+            with open(self.log_path, "r+b") as f:
+                f.truncate(end)
+
+    def _append(self, run):
+        if self.error is not None:
+            return
+        try:
+            if self._log is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._log = open(self.log_path, "ab")
+            self._log.write(run.pack())
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log_end += RECORD.size
+            self.runs_logged += 1
+        except OSError as e:
+            self.error = e
+
+    def _publish(self, run):
+        top = sorted(self.top + (run,), key=Run.sort_key)[:self.top_n]
+        self.top = tuple(top)
+        self.last = (run, top.index(run) + 1 if run in top else None)
+
+    def compact(self):
+        """Reescreve o índice com o ranking atual (só na thread de gravação ou depois do close)."""
+        if self.error is not None or self._log_end == 0:
+            return
+        top = self.top
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(top), self._log_end))
+                for run in top:
+                    f.write(run.pack())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.index_path)
+            self.compactions += 1
+        except OSError as e:
+            self.error = e
+
+
+def format_run(pos, run):
+    minutes, seconds = divmod(run.duration_ms // 1000, 60)
+    return (f"{pos:>2}. {run.score:>6} pts  {run.kills:>4} kills  wave {run.wave}"
+            f"  {run.accuracy:>4.0%}  {minutes}:{seconds:02d}{'  venceu' if run.won else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=SCORES_DIR)
+    parser.add_argument("--all", action="store_true", help="estatísticas de todas as partidas do log")
+    args = parser.parse_args()
+
+    log_path = os.path.join(args.dir, LOG_NAME)
+    if args.all:
+        runs, _ = read_log(log_path)
+        ranking = runs
+    else:
+        runs = []
+        top, covered = read_index(os.path.join(args.dir, INDEX_NAME))
+        tail, _ = read_log(log_path, covered)
+        ranking = top + tail
+    for pos, run in enumerate(sorted(ranking, key=Run.sort_key)[:TOP_N], 1):
+        print(format_run(pos, run))
+    if runs:
+        shots = sum(r.shots for r in runs)
+        print(f"{len(runs)} partidas, {sum(r.kills for r in runs)} kills, "
+              f"precisão {sum(r.hits for r in runs) / shots if shots else 0.0:.0%}, "
+              f"{sum(r.won for r in runs)} vitórias")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# spatial.py
+import math
+
+
+class SpatialHash:
+    """
+    Hash espacial uniforme: agrupa retângulos por célula (pelo centro).
+    Com cell_size >= raio de busca, vizinhos ficam no bloco 3x3 de células.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_of(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, rect):
+        key = self.cell_of(rect.x + rect.width / 2, rect.y + rect.height / 2)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [rect]
+        else:
+            bucket.append(rect)
+
+    def rebuild(self, rects):
+        self.cells.clear()
+        for r in rects:
+            self.insert(r)
+
+    def nearby(self, x, y):
+        cx, cy = self.cell_of(x, y)
+        cells = self.cells
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield from bucket
+
+    def query_rect(self, rect):
+        # itens são indexados pelo centro; meia célula de margem cobre
+        # qualquer item de tamanho <= cell_size que encoste no rect
+        half = self.cell_size / 2
+        x0, y0 = self.cell_of(rect.left - half, rect.top - half)
+        x1, y1 = self.cell_of(rect.right + half, rect.bottom + half)
+        cells = self.cells
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield from bucket
+
+
+def compact(items, pool=None):
+    """Remove, no lugar, os itens marcados com alive = False (tombstones).
+    Com pool, os removidos voltam para ele."""
+    j = 0
+    for it in items:
+        if it.alive:
+            items[j] = it
+            j += 1
+        elif pool is not None:
+            pool.release(it)
+    del items[j:]
+
+
+def sweep(x, y, dx, dy, rect, half):
+    """
+    Varredura de um quadrado de meio-lado `half` com centro indo de (x, y)
+    até (x + dx, y + dy) contra o rect (segmento contra o rect aumentado de
+    `half`, método das slabs). Retorna a fração t em [0, 1] do primeiro
+    contato, ou None. Só encostar na borda não conta, como no colliderect.
+    """
+    t0 = 0.0
+    t1 = 1.0
+    lo = rect.left - half
+    hi = rect.right + half
+    if dx == 0:
+        if x <= lo or x >= hi:
+            return None
+    else:
+        ta = (lo - x) / dx
+        tb = (hi - x) / dx
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t0:
+            t0 = ta
+        if tb < t1:
+            t1 = tb
+        if t0 >= t1:
+            return None
+    lo = rect.top - half
+    hi = rect.bottom + half
+    if dy == 0:
+        if y <= lo or y >= hi:
+            return None
+    else:
+        ta = (lo - y) / dy
+        tb = (hi - y) / dy
+        if ta > tb:
+            ta, tb = tb, ta
+        if ta > t0:
+            t0 = ta
+        if tb < t1:
+            t1 = tb
+        if t0 >= t1:
+            return None
+    return t0
+
+
+class ObstacleIndex:
+    """
+    Índice estático dos obstáculos de um layout: cada célula da grade guarda
+    os obstáculos que a tocam, então um teste de colisão só olha as poucas
+    células cobertas pelo rect em vez de todos os obstáculos.
+    """
+
+    def __init__(self, cell_size, obstacles=()):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.obstacles = []
+        for o in obstacles:
+            self.add(o)
+
+    def __len__(self):
+        return len(self.obstacles)
+
+    def __iter__(self):
+        return iter(self.obstacles)
+
+    def clear(self):
+        self.cells.clear()
+        self.obstacles.clear()
+
+    def rebuild(self, obstacles):
+        self.clear()
+        for o in obstacles:
+            self.add(o)
+
+    def _span(self, rect):
+        cs = self.cell_size
+        # right/bottom são exclusivos no pygame.Rect
+        return (rect.left // cs, rect.top // cs,
+                (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def add(self, rect):
+        self.obstacles.append(rect)
+        x0, y0, x1, y1 = self._span(rect)
+        cells = self.cells
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if bucket is None:
+                    cells[(gx, gy)] = [rect]
+                else:
+                    bucket.append(rect)
+
+    def candidates(self, rect):
+        """Obstáculos nas células do rect (pode repetir; não testa colisão)."""
+        x0, y0, x1, y1 = self._span(rect)
+        cells = self.cells
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield from bucket
+
+    def collides(self, rect):
+        # laço explícito (sem gerador): é chamado várias vezes por zumbi por tick
+        cs = self.cell_size
+        x0 = rect.left // cs
+        x1 = (rect.right - 1) // cs
+        y0 = rect.top // cs
+        y1 = (rect.bottom - 1) // cs
+        cells = self.cells
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if bucket and rect.collidelist(bucket) != -1:
+                    return True
+        return False
+
+
+def obstacle_candidates(obstacles, rect):
+    """Aceita lista de rects ou ObstacleIndex."""
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.candidates(rect)
+    return obstacles
+
+
+def blocked(obstacles, rect):
+    """True se rect colide com algum obstáculo (lista ou ObstacleIndex)."""
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.collides(rect)
+    return any(rect.colliderect(o) for o in obstacles)
@@ -0,0 +1,265 @@
+# swarm.py
+# Motor de horda em NumPy (opcional): posições, velocidades e hp de
+# todos os zumbis em arrays contíguos, com seek, separação, desvio de
+# obstáculos e knockback calculados em passadas vetorizadas.
+# Os objetos Enemy continuam existindo como "views" finas para o resto do jogo.
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional
+    np = None
+
+# mesmos ângulos de desvio usados em Enemy.move_towards_player
+PROBE_ANGLES = (15, -15, 30, -30, 45, -45)
+
+
+def available():
+    return np is not None
+
+
+class Swarm:
+    def __init__(self, size, seed=None):
+        if np is None:
+            raise RuntimeError("swarm.py precisa do numpy instalado")
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.views = []
+        self.pos = np.zeros((0, 2))
+        self.speed = np.zeros(0)
+        self.hp = np.zeros(0, dtype=np.int32)
+        self.occupancy = None
+        self._field_key = None
+        self._field_dirs = None
+
+    def __len__(self):
+        return len(self.views)
+
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    # -----------------------
+    # views <-> arrays
+    # -----------------------
+    def attach(self, enemies):
+        """Passa a simular a lista de inimigos (a mesma lista é mantida compactada)."""
+        self.views = enemies
+        n = len(enemies)
+        self.pos = np.array([(e.pos.x, e.pos.y) for e in enemies], dtype=np.float64).reshape(n, 2)
+        self.speed = np.array([e.speed for e in enemies], dtype=np.float64)
+        self.hp = np.array([e.hp for e in enemies], dtype=np.int32)
+        for i, e in enumerate(enemies):
+            e._swarm = self
+            e._slot = i
+
+    def set_obstacles(self, obstacles):
+        # mapa de ocupação por pixel em forma de tabela de soma acumulada:
+        # "algum pixel de obstáculo dentro do rect?" vira 4 leituras, O(1)
+        obstacles = list(obstacles)
+        if not obstacles:
+            self.occupancy = None
+            return
+        w = max(o.right for o in obstacles)
+        h = max(o.bottom for o in obstacles)
+        grid = np.zeros((h, w), dtype=np.int32)
+        for o in obstacles:
+            grid[max(o.top, 0):o.bottom, max(o.left, 0):o.right] = 1
+        table = np.zeros((h + 1, w + 1), dtype=np.int32)
+        table[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+        self.occupancy = table
+
+    def sync_views(self):
+        # só o rect (colisão, grid, desenho); o pos float das views fica com
+        # os arrays e só é copiado quando alguém precisa dele (hit)
+        xy = np.trunc(self.pos).astype(np.int64)
+        for e, x, y in zip(self.views, xy[:, 0].tolist(), xy[:, 1].tolist()):
+            e.x = x
+            e.y = y
+
+    def compact(self, pool=None):
+        """Remove os inimigos com alive = False dos arrays e da lista de views.
+        Com pool, as views removidas voltam para ele."""
+        views = self.views
+        keep = np.fromiter((e.alive for e in views), dtype=bool, count=len(views))
+        if keep.all():
+            return
+        self.pos = self.pos[keep]
+        self.speed = self.speed[keep]
+        self.hp = self.hp[keep]
+        j = 0
+        for e in views:
+            if e.alive:
+                e._slot = j
+                views[j] = e
+                j += 1
+            elif pool is not None:
+                e._swarm = None
+                pool.release(e)
+        del views[j:]
+
+    # -----------------------
+    # simulação
+    # -----------------------
+    def step(self, player, field=None):
+        n = len(self.views)
+        if n == 0:
+            return
+        half = self.size / 2
+        pos = self.pos
+        center = pos + half
+
+        # seek (pelo campo de fluxo, quando houver)
+        to_target = np.array([player.centerx, player.centery], dtype=np.float64) - center
+        dist = np.hypot(to_target[:, 0], to_target[:, 1])
+        moving = dist >= 0.1
+        safe = np.where(moving, dist, 1.0)
+        direction = to_target / safe[:, None]
+        if field is not None:
+            direction = self._follow(field, center, direction)
+        desired = direction * self.speed[:, None]
+
+        desired += self._separation(center)
+
+        # obstáculos: reto, perpendiculares, ângulos e por fim recuo; depois do
+        # passo reto só os que bateram (poucos) passam pelas outras tentativas
+        new_pos = pos.copy()
+        cand = pos + desired
+        ok = moving & ~self._blocked(cand)
+        new_pos[ok] = cand[ok]
+        stuck = np.flatnonzero(moving & ~ok)
+        if len(stuck):
+            new_pos[stuck] = self._dodge(pos[stuck], desired[stuck], self.speed[stuck])
+        self.pos = new_pos
+        self.sync_views()
+
+    def _dodge(self, pos, desired, speed):
+        """Posições novas de quem bateu de frente num obstáculo."""
+        out = pos - desired * 0.5
+        pending = np.ones(len(pos), dtype=bool)
+        perp = np.stack((-desired[:, 1], desired[:, 0]), axis=1)
+        plen = np.hypot(perp[:, 0], perp[:, 1])
+        has_perp = plen > 0
+        perp = perp / np.where(has_perp, plen, 1.0)[:, None] * (speed * 0.6)[:, None]
+        flip = self.rng.random(len(pos)) < 0.5
+        first = np.where(flip[:, None], perp, -perp)
+        for side in (first, -first):
+            cand = pos + side
+            ok = has_perp & pending & ~self._blocked(cand)
+            out[ok] = cand[ok]
+            pending &= ~ok
+
+        for angle in PROBE_ANGLES:
+            if not pending.any():
+                break
+            c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+            alt = np.stack((desired[:, 0] * c - desired[:, 1] * s,
+                            desired[:, 0] * s + desired[:, 1] * c), axis=1)
+            cand = pos + alt
+            ok = pending & ~self._blocked(cand)
+            out[ok] = cand[ok]
+            pending &= ~ok
+        return out
+
+    def _follow(self, field, center, direct):
+        if self._field_key != (id(field), field.version):
+            self._field_dirs = np.stack((np.array(field.dir_x), np.array(field.dir_y)), axis=1)
+            self._field_key = (id(field), field.version)
+        cs = field.cell_size
+        col = np.floor(center[:, 0] / cs).astype(np.int64)
+        row = np.floor(center[:, 1] / cs).astype(np.int64)
+        inside = (col >= 0) & (col < field.cols) & (row >= 0) & (row < field.rows)
+        flow = self._field_dirs[np.where(inside, row * field.cols + col, 0)]
+        use = inside & ((flow[:, 0] != 0) | (flow[:, 1] != 0))
+        return np.where(use[:, None], flow, direct)
+
+    def _separation(self, center):
+        # hash espacial vetorizado numa grade densa (chave = linha * cols +
+        # coluna, com borda de uma célula). Cada par é visto uma vez só: a
+        # própria célula (i < j) mais 4 das 8 vizinhas, e a força entra com
+        # sinal trocado no outro agente
+        size = self.size
+        n = len(center)
+        cell = np.floor(center / size).astype(np.int64)
+        cx = cell[:, 0] - cell[:, 0].min() + 1
+        cy = cell[:, 1] - cell[:, 1].min() + 1
+        cols = int(cx.max()) + 2
+        key = cy * cols + cx
+        order = np.argsort(key, kind="stable")
+        counts = np.bincount(key, minlength=(int(cy.max()) + 2) * cols)
+        start = np.cumsum(counts) - counts
+
+        # tudo na ordem das células: os gathers de i e j ficam quase contíguos
+        key = key[order]
+        x = center[order, 0]
+        y = center[order, 1]
+        sep_x = np.zeros(n)
+        sep_y = np.zeros(n)
+        agents = np.arange(n)
+        for offset in (0, 1, cols - 1, cols, cols + 1):
+            nkey = key + offset
+            cnt = counts[nkey]
+            total = int(cnt.sum())
+            if total == 0:
+                continue
+            i = np.repeat(agents, cnt)
+            k = np.arange(total) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            j = np.repeat(start[nkey], cnt) + k
+            ox = x[i] - x[j]
+            oy = y[i] - y[j]
+            d2 = ox * ox + oy * oy
+            mask = (d2 > 0) & (d2 < size * size)
+            if offset == 0:
+                mask &= i < j
+            d = np.sqrt(d2[mask])
+            w = (size - d) * 0.02 / d
+            i = i[mask]
+            j = j[mask]
+            fx = ox[mask] * w
+            fy = oy[mask] * w
+            sep_x += np.bincount(i, weights=fx, minlength=n) - np.bincount(j, weights=fx, minlength=n)
+            sep_y += np.bincount(i, weights=fy, minlength=n) - np.bincount(j, weights=fy, minlength=n)
+        sep = np.empty((n, 2))
+        sep[order, 0] = sep_x
+        sep[order, 1] = sep_y
+        return sep
+
+    def _blocked(self, cand):
+        # mesmo resultado de pygame.Rect.colliderect com o rect truncado para int
+        table = self.occupancy
+        if table is None:
+            return np.zeros(len(cand), dtype=bool)
+        h, w = table.shape[0] - 1, table.shape[1] - 1
+        x0 = np.trunc(cand[:, 0]).astype(np.int64)
+        y0 = np.trunc(cand[:, 1]).astype(np.int64)
+        x1 = np.clip(x0 + self.size, 0, w)
+        y1 = np.clip(y0 + self.size, 0, h)
+        x0 = np.clip(x0, 0, w)
+        y0 = np.clip(y0, 0, h)
+        total = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        return total > 0
+
+    def touching(self, rect):
+        """Views cujo rect encosta no rect dado (ex.: o player)."""
+        if not self.views:
+            return []
+        x = np.trunc(self.pos[:, 0])
+        y = np.trunc(self.pos[:, 1])
+        s = self.size
+        hit = (x < rect.right) & (rect.left < x + s) & (y < rect.bottom) & (rect.top < y + s)
+        return [self.views[i] for i in np.flatnonzero(hit)]
+
+    def hit(self, i, bx, by):
+        """hit_react do inimigo i (knockback de 40px); retorna True se morreu."""
+        self.hp[i] -= 1
+        dx = self.pos[i, 0] - bx
+        dy = self.pos[i, 1] - by
+        dist = max(math.hypot(dx, dy), 1)
+        self.pos[i, 0] += (dx / dist) * 40
+        self.pos[i, 1] += (dy / dist) * 40
+
+        e = self.views[i]
+        e.hp = int(self.hp[i])
+        e.pos.x = float(self.pos[i, 0])
+        e.pos.y = float(self.pos[i, 1])
+        e._sync_rect()
+        return e.hp <= 0
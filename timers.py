@@ -0,0 +1,151 @@
+# timers.py
+# Timers no relógio da simulação: em vez de cada sistema guardar um "desde
+# quando" e comparar com get_ticks() (ou decrementar um contador) todo
+# frame, quem precisa esperar agenda um callback aqui. O Game avança o
+# Scheduler pelo mesmo dt do passo fixo, então os timers acompanham o
+# fast-forward sem tela, os replays e o pause, e nunca olham o relógio real.
+#
+# Heap ordenado por (vencimento, ordem de agendamento): um tick custa
+# O(timers que vencem · log n), não O(entidades com timer). Cancelar ou
+# pausar só invalida a entrada (o heap é limpo quando as inválidas passam
+# da metade).
+import heapq
+import itertools
+
+# entradas inválidas toleradas no heap antes de reconstruí-lo
+COMPACT_MIN_STALE = 64
+
+
+class Timer:
+    """Handle de um timer agendado (Scheduler.after / Scheduler.every)."""
+    __slots__ = ("scheduler", "due", "interval", "callback", "args", "seq", "remaining", "done")
+
+    def __init__(self, scheduler, interval, callback, args):
+        self.scheduler = scheduler
+        self.due = 0.0
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        # seq da entrada válida no heap (None = fora do heap: pausado, cancelado ou disparado)
+        self.seq = None
+        # tempo que faltava quando foi pausado
+        self.remaining = None
+        self.done = False
+
+    @property
+    def active(self):
+        return not self.done
+
+    @property
+    def paused(self):
+        return self.remaining is not None
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+    def pause(self):
+        self.scheduler.pause_timer(self)
+
+    def resume(self):
+        self.scheduler.resume_timer(self)
+
+
+class Scheduler:
+    """
+    after(delay, f, *args) dispara f(*args) uma vez; every(interval, f, *args)
+    repete. advance(dt) avança o relógio (ms) e dispara o que venceu, em ordem
+    de vencimento; um dt grande dispara cada período de um timer repetido que
+    ficou para trás. pause() congela o relógio inteiro; Timer.pause() só um timer.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.paused = False
+        self.fired = 0
+        self._heap = []
+        self._stale = 0
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap) - self._stale
+
+    def after(self, delay, callback, *args):
+        timer = Timer(self, 0.0, callback, args)
+        self._push(timer, self.now + delay)
+        return timer
+
+    def every(self, interval, callback, *args, first=None):
+        """Repete a cada `interval` ms; o primeiro disparo em `first` ms (padrão: interval)."""
+        if interval <= 0:
+            raise ValueError("interval deve ser positivo")
+        timer = Timer(self, interval, callback, args)
+        self._push(timer, self.now + (interval if first is None else first))
+        return timer
+
+    def _push(self, timer, due):
+        timer.due = due
+        timer.seq = next(self._counter)
+        heapq.heappush(self._heap, (due, timer.seq, timer))
+
+    def _invalidate(self, timer):
+        if timer.seq is not None:
+            timer.seq = None
+            self._stale += 1
+
+    def cancel(self, timer):
+        self._invalidate(timer)
+        timer.remaining = None
+        timer.done = True
+
+    def pause_timer(self, timer):
+        if timer.done or timer.remaining is not None:
+            return
+        timer.remaining = max(timer.due - self.now, 0.0)
+        self._invalidate(timer)
+
+    def resume_timer(self, timer):
+        if timer.done or timer.remaining is None:
+            return
+        self._push(timer, self.now + timer.remaining)
+        timer.remaining = None
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def clear(self):
+        for _, _, timer in self._heap:
+            timer.seq = None
+            timer.done = True
+        self._heap.clear()
+        self._stale = 0
+
+    def advance(self, dt):
+        """Avança dt ms (nada se pausado) e dispara os timers vencidos. Retorna quantos dispararam."""
+        if self.paused:
+            return 0
+        self.now += dt
+        now = self.now
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            due, seq, timer = heapq.heappop(heap)
+            if timer.seq != seq:
+                self._stale -= 1
+                continue
+            if timer.interval:
+                # reagenda antes do callback, que pode cancelar
+                self._push(timer, due + timer.interval)
+            else:
+                timer.seq = None
+                timer.done = True
+            timer.callback(*timer.args)
+            fired += 1
+        self.fired += fired
+        if self._stale > COMPACT_MIN_STALE and self._stale * 2 > len(heap):
+            self._heap = [entry for entry in heap if entry[2].seq == entry[1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+        return fired